@@ -1,2 +1,21 @@
-from .main import app
-app(prog_name="superscript")
\ No newline at end of file
+import sys
+
+from .helper.cachedcompletion import complete_from_cache
+from .helper.daemon import forward
+
+
+def run():
+    # completion of tools, categories and options must not wait for typer and the config
+    exitcode = complete_from_cache()
+    if exitcode is not None:
+        sys.exit(exitcode)
+    # forward to a resident daemon if one is running, otherwise execute in-process
+    exitcode = forward(sys.argv[1:])
+    if exitcode is not None:
+        sys.exit(exitcode)
+    from .main import app
+    app(prog_name="superscript")
+
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,122 @@
+import os
+import sys
+import json
+import shlex
+from pathlib import Path
+
+# only the standard library is imported here, completion answers before the CLI with typer and the config is loaded
+COMPLETE_VARIABLE = "_SUPERSCRIPT_COMPLETE"
+COMPLETION_FILE = "completion.json"
+
+
+def get_completion_path():
+    # same location as typer.get_app_dir("superscript"), None where it differs too much to rebuild it here
+    if sys.platform == "darwin":
+        return Path.home() / "Library" / "Application Support" / "superscript" / COMPLETION_FILE
+    if os.name == "nt":
+        return None
+    configpath = os.environ.get("XDG_CONFIG_HOME", os.path.expanduser("~/.config"))
+    return Path(configpath) / "superscript" / COMPLETION_FILE
+
+
+def split_words(line):
+    try:
+        return shlex.split(line)
+    except ValueError:
+        # unfinished quote while typing
+        return line.split()
+
+
+def get_completion_args(shell):
+    if shell == "bash":
+        words = split_words(os.environ.get("COMP_WORDS", ""))
+        cword = int(os.environ.get("COMP_CWORD", len(words)))
+        return words[1:cword], words[cword] if cword < len(words) else ""
+    line = os.environ.get("_TYPER_COMPLETE_ARGS", "")
+    args = split_words(line)[1:]
+    if shell in ("powershell", "pwsh"):
+        return args, os.environ.get("_TYPER_COMPLETE_WORD_TO_COMPLETE", "")
+    if args and not line.endswith(" "):
+        return args[:-1], args[-1]
+    return args, ""
+
+
+def get_candidates(completion, args, incomplete):
+    """
+    Returns the candidates from the completion cache or None if the cache can't answer.
+    """
+    commands = completion["commands"]
+    command = None
+    position = 0
+    expected = None
+    for argument in args:
+        if expected is not None:
+            expected = None
+        elif argument.startswith("-"):
+            if command and argument in commands[command]["values"]:
+                expected = argument
+        elif command is None:
+            if argument not in commands:
+                return None
+            command = argument
+        else:
+            position += 1
+    # options of the main callback are not cached
+    if command is None:
+        return None if incomplete.startswith("-") else sorted(commands)
+    if expected is not None:
+        kind = commands[command]["values"][expected]
+    elif incomplete.startswith("-"):
+        return commands[command]["options"]
+    elif position < len(commands[command]["arguments"]):
+        kind = commands[command]["arguments"][position]
+    else:
+        kind = None
+    if kind is None:
+        return None
+    return completion[kind]
+
+
+def format_completions(shell, values):
+    if shell == "zsh":
+        if not values:
+            return "_files"
+        escaped = "\n".join('"{}"'.format(
+            value.replace('"', '""').replace("'", "''").replace("$", "\\$").replace("`", "\\`")
+        ) for value in values)
+        return f"_arguments '*: :(({escaped}))'"
+    if shell in ("powershell", "pwsh"):
+        return "\n".join(f"{value}::: " for value in values)
+    return "\n".join(values)
+
+
+def complete_from_cache():
+    """
+    Answers a shell completion request from the completion cache written next to the config.
+
+    Returns the exit code or None if the request has to be answered by the full CLI.
+    """
+    instruction = os.environ.get(COMPLETE_VARIABLE, "")
+    if not instruction.startswith("complete_"):
+        return None
+    shell = instruction[len("complete_"):]
+    cachepath = get_completion_path()
+    try:
+        with open(cachepath, 'r') as f:
+            completion = json.load(f)
+        args, incomplete = get_completion_args(shell)
+        candidates = get_candidates(completion, args, incomplete)
+    except (OSError, TypeError, ValueError, KeyError, AttributeError):
+        # no cache yet or one written by an older version
+        return None
+    if candidates is None:
+        return None
+    values = [value for value in candidates if value.startswith(incomplete)]
+    if shell == "fish":
+        action = os.environ.get("_TYPER_COMPLETE_FISH_ACTION", "")
+        if action == "is-args":
+            return 0 if values else 1
+        if action != "get-args":
+            return 0
+    print(format_completions(shell, values))
+    return 0
@@ -0,0 +1,85 @@
+import json
+from pathlib import Path
+
+import click
+import typer
+
+from constants import APP_NAME, COMPLETION_CACHE
+
+
+def get_completion_cachepath():
+    return Path(typer.get_app_dir(APP_NAME)) / COMPLETION_CACHE
+
+
+# parameters with these names complete from the cached tools or categories
+COMPLETED_PARAMETERS = {"toolname": "tools", "category": "categories"}
+
+
+def get_command_options():
+    """
+    Collects the options of all commands from the running CLI, None if not called from within a command.
+
+    Per command the options, the completed values of options taking a value and of the arguments are stored.
+    """
+    context = click.get_current_context(silent=True)
+    if context is None:
+        return None
+    root = context.find_root().command
+    commands = {}
+    for name, command in getattr(root, "commands", {}).items():
+        options = []
+        values = {}
+        arguments = []
+        for parameter in command.params:
+            completed = COMPLETED_PARAMETERS.get(parameter.name)
+            if isinstance(parameter, click.Argument):
+                arguments.append(completed)
+                continue
+            options.extend(parameter.opts + parameter.secondary_opts)
+            if not parameter.is_flag:
+                values.update({option: completed for option in parameter.opts})
+        commands[name] = {"options": options, "values": values, "arguments": arguments}
+    return commands
+
+
+def write_completion_cache(path: Path, superconfig):
+    """
+    Writes tool names, categories and command options next to the config, so completion never parses the yaml.
+    """
+    previous = read_completion_cache(path)
+    components = superconfig.get("components") or {}
+    categorytools = {}
+    for category in components:
+        # categories of a sharded config which were not read keep their cached tools
+        if hasattr(components, "is_loaded") and not components.is_loaded(category) \
+                and category in previous.get("components", {}):
+            categorytools[category] = previous["components"][category]
+        else:
+            categorytools[category] = sorted(components[category] or {})
+    commands = get_command_options()
+    if commands is None:
+        commands = previous.get("commands", {})
+    completion = {
+        "tools": sorted(tool for tools in categorytools.values() for tool in tools),
+        "categories": sorted(categorytools),
+        "components": categorytools,
+        "commands": commands
+    }
+    with open(path, 'w+') as f:
+        f.write(json.dumps(completion))
+
+
+def read_completion_cache(path: Path = None):
+    try:
+        with open(path or get_completion_cachepath(), 'r') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def complete_toolname(incomplete: str):
+    return [tool for tool in read_completion_cache().get("tools", []) if tool.startswith(incomplete)]
+
+
+def complete_category(incomplete: str):
+    return [category for category in read_completion_cache().get("categories", []) if category.startswith(incomplete)]
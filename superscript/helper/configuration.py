@@ -1,10 +1,15 @@
+import copy
 import typer
 import yaml
 import shutil
 import git
+from collections.abc import MutableMapping
 from pathlib import Path
+from urllib.parse import quote, unquote
 
-from constants import APP_NAME, DEFAULT_CONFIG, GITENDING, UNCATEGORIZED
+from constants import APP_NAME, DEFAULT_CONFIG, GITENDING, UNCATEGORIZED, COMPLETION_CACHE, \
+    SHARDED_CONFIG, SHARD_FOLDER, SHARD_ENDING
+from completion import write_completion_cache
 from fshandling import check_path_create
 from printing import write_verbose, write_error, write_question, write_success
 
@@ -35,18 +40,157 @@ def create_config(
     save_superconfig(path, "Add initial configuration file", True)
 
 
+# parsed yaml files by path, mtime and size, keeps a resident daemon from parsing the yaml on every command
+superconfig_cache = {}
+
+
+def load_yaml(path: Path):
+    """
+    Returns the parsed content and the raw text of a yaml file, both cached until the file changes.
+    """
+    stat = path.stat()
+    cachekey = (stat.st_mtime_ns, stat.st_size)
+    if superconfig_cache.get(str(path), (None,))[0] != cachekey:
+        write_verbose(f"Parsing {path}")
+        with open(path, 'r') as f:
+            content = f.read()
+        # TODO: error handling if file could not be loaded, e.g. no yaml format!
+        superconfig_cache[str(path)] = (cachekey, yaml.load(content, Loader=yaml.Loader), content)
+    _, parsed, content = superconfig_cache[str(path)]
+    # commands modify the config in place, so never hand out the cached one
+    return copy.deepcopy(parsed), content
+
+
+class ShardedComponents(MutableMapping):
+    """
+    Components of the sharded config layout, every category lives in its own yaml file.
+
+    A category file is only read when the category itself is accessed.
+    """
+    def __init__(self, shardpath: Path):
+        self.shardpath = shardpath
+        self.shards = {}
+        self.shardtexts = {}
+        self.removed = set()
+        self.categories = []
+        if shardpath.is_dir():
+            self.categories = [unquote(shardfile.stem) for shardfile in sorted(shardpath.glob("*" + SHARD_ENDING))]
+
+    def get_shardfile(self, category):
+        return self.shardpath / (quote(category, safe="()") + SHARD_ENDING)
+
+    def is_loaded(self, category):
+        return category in self.shards
+
+    def __getitem__(self, category):
+        if category not in self.categories:
+            raise KeyError(category)
+        if category not in self.shards:
+            self.shards[category], self.shardtexts[category] = load_yaml(self.get_shardfile(category))
+        return self.shards[category]
+
+    def __setitem__(self, category, components):
+        if category not in self.categories:
+            self.categories.append(category)
+        self.removed.discard(category)
+        self.shards[category] = components
+
+    def __delitem__(self, category):
+        if category not in self.categories:
+            raise KeyError(category)
+        self.categories.remove(category)
+        self.shards.pop(category, None)
+        self.removed.add(category)
+
+    def __contains__(self, category):
+        return category in self.categories
+
+    def __iter__(self):
+        return iter(self.categories[:])
+
+    def __len__(self):
+        return len(self.categories)
+
+
+def get_superconfig_path(appdir: Path):
+    """
+    Returns the root file of the sharded layout if one is in place, otherwise the single superconfig file.
+    """
+    shardedpath = appdir / SHARDED_CONFIG
+    if shardedpath.is_file():
+        return shardedpath
+    return appdir / DEFAULT_CONFIG
+
+
 def load_superconfig(path):
     global superconfig
     if path.is_file():
-        with open(path, 'r') as f:
-            supercontent = f.read()
-        superconfig = yaml.load(supercontent, Loader=yaml.Loader)
-        # TODO: error handling if file could not be loaded, e.g. no yaml format!
+        superconfig, _ = load_yaml(path)
+        if path.name == SHARDED_CONFIG:
+            write_verbose("Using sharded config with one file per category")
+            superconfig["components"] = ShardedComponents(path.parent / SHARD_FOLDER)
+        # completion answers from the cache only, a config from before the cache existed needs it once
+        if not (path.parent / COMPLETION_CACHE).is_file():
+            write_completion_cache(path.parent / COMPLETION_CACHE, superconfig)
+        return superconfig
     else:
         write_error(f"No such file {path} to load superconfig from")
         # Q: maybe exit?
 
 
+def write_if_changed(path: Path, content, previous=None):
+    if previous is None and path.is_file():
+        previous = path.read_text()
+    if content == previous:
+        return False
+    check_path_create(path.parent)
+    with open(path, 'w+') as f:
+        f.write(content)
+    return True
+
+
+def write_superconfig(path: Path):
+    """
+    Writes the config in the layout of its components and returns the written and the removed files.
+
+    Files of the other layout are removed, so converting the layout is just a save.
+    """
+    components = superconfig.get("components")
+    singlepath = path.parent / DEFAULT_CONFIG
+    shardedpath = path.parent / SHARDED_CONFIG
+    shardpath = path.parent / SHARD_FOLDER
+    written = []
+    removed = []
+    if isinstance(components, ShardedComponents):
+        root = {key: value for key, value in superconfig.items() if key != "components"}
+        if write_if_changed(shardedpath, yaml.dump(root, Dumper=yaml.Dumper)):
+            written.append(shardedpath)
+        # only categories which were accessed can have changed
+        for category, shard in components.shards.items():
+            shardfile = components.get_shardfile(category)
+            content = yaml.dump(shard, Dumper=yaml.Dumper)
+            if write_if_changed(shardfile, content, components.shardtexts.get(category)):
+                components.shardtexts[category] = content
+                written.append(shardfile)
+        for category in components.removed:
+            removed.append(components.get_shardfile(category))
+        components.removed.clear()
+        if singlepath.is_file():
+            removed.append(singlepath)
+    else:
+        with open(singlepath, 'w+') as f:
+            f.write(yaml.dump(superconfig, Dumper=yaml.Dumper))
+        written.append(singlepath)
+        if shardedpath.is_file():
+            removed.append(shardedpath)
+        if shardpath.is_dir():
+            removed.extend(shardpath.glob("*" + SHARD_ENDING))
+    removed = [removedfile for removedfile in removed if removedfile.is_file()]
+    for removedfile in removed:
+        removedfile.unlink()
+    return written, removed
+
+
 def save_superconfig(
     path=Path(typer.get_app_dir(APP_NAME)) / DEFAULT_CONFIG,
     commitcontent="Add changes in superscript config",
@@ -75,22 +219,46 @@ def save_superconfig(
         else:
             write_verbose(f"Using existing repo to save config")
             repo = git.Repo(str(path.parent))
-    with open(path, 'w+') as f:
-        f.write(yaml.dump(superconfig, Dumper=yaml.Dumper))
+    written, removed = write_superconfig(path)
+    write_completion_cache(path.parent / COMPLETION_CACHE, superconfig)
+    if not written and not removed:
+        write_verbose("Config file unchanged, nothing to save")
+        return
     if superconfig["config"]["gitvcs"]:
-        repo.index.add(str(path))
+        if written:
+            repo.index.add([str(writtenfile) for writtenfile in written])
+        if removed:
+            repo.index.remove([str(removedfile) for removedfile in removed])
         repo.index.commit(commitcontent)
     if superconfig["config"]["gitvcs"] and superconfig["config"]["gitsaveurl"] and superconfig["config"]["autosave"]:
         repo.push()
     write_verbose("Config file successfully written")
 
 
+def convert_superconfig(path: Path, sharded=True):
+    """
+    Converts the loaded config between the single file and the sharded layout with one file per category.
+    """
+    global superconfig
+    components = superconfig.get("components") or {}
+    if sharded:
+        shardedcomponents = ShardedComponents(path.parent / SHARD_FOLDER)
+        for category in components:
+            shardedcomponents[category] = components[category]
+        superconfig["components"] = shardedcomponents
+        commitcontent = "Split superscript config into one file per category"
+    else:
+        superconfig["components"] = {category: components[category] for category in components}
+        commitcontent = "Merge superscript config into a single file"
+    save_superconfig(path, commitcontent)
+
+
 def config_path_adjust(base, category=UNCATEGORIZED):
     global superconfig
     if base not in superconfig:
         write_verbose(f"{base} is actually not in config file, going to create it")
         superconfig[base] = None
-    if not superconfig[base]:
+    if superconfig[base] is None:
         write_verbose(f"{base} has value None in config file, going to set to {category}")
         superconfig[base] = {category: None}
     elif category not in superconfig[base]:
@@ -32,3 +32,36 @@ TYPES = {
     "gitrelease": "gitrelease",
     "urlfile": "urlfile"
 }
+
+VENV_FOLDER = "venvs"
+WHEEL_CACHE = "wheels"
+SITE_STORE = "site-store"
+REQUIREMENTS = "requirements.txt"
+# hash of the requirements installed into an environment, written after a successful install
+REQUIREMENTS_MARKER = "superscript-requirements.sha256"
+COMPLETION_CACHE = "completion.json"
+SHARDED_CONFIG = "config.yml"
+SHARD_FOLDER = "components"
+SHARD_ENDING = ".yml"
+UPDATE_STATE = "updatestate.json"
+# seconds between two update checks of a component by type
+SCHEDULE_INTERVALS = {
+    "git": 6 * 3600,
+    "gitrelease": 12 * 3600,
+    "urlfile": 24 * 3600
+}
+SCHEDULE_JITTER = 0.1
+# requests per period in seconds by host, the github api allows 60 unauthenticated requests per hour
+RATE_BUDGETS = {
+    "api.github.com": (60, 3600),
+    "default": (30, 60)
+}
+BACKOFF_START = 60
+BACKOFF_MAX = 3600
+WIKI_CACHE = "wikicache.json"
+WIKI_FOLDER = "wikis"
+# seconds a checked wiki existence stays valid
+WIKI_TTL = 3600
+WIKIENDING = ".wiki.git"
+RENDER_CACHE = "rendercache"
+VERIFY_CACHE = "verifycache.json"
@@ -0,0 +1,179 @@
+import io
+import os
+import sys
+import json
+import shutil
+import socket
+import traceback
+from contextlib import redirect_stdout, redirect_stderr
+from pathlib import Path
+
+# only the standard library is imported here, the client has to start faster than the full CLI
+DAEMON_SOCKET = "superscript.sock"
+DAEMON_COMMAND = "daemon"
+FORWARDED_ENV_PREFIXES = ("_SUPERSCRIPT_COMPLETE", "_TYPER_COMPLETE", "COMP_")
+# execute replaces the process, schedule never returns and the others may prompt on the terminal
+IN_PROCESS_COMMANDS = (DAEMON_COMMAND, "execute", "schedule", "restore", "clone", "urlfile")
+# global options which take a value, needed to find the subcommand in the command line
+VALUE_OPTIONS = ("--installpath", "--gitsaveurl")
+
+
+def get_socketpath():
+    if "SUPERSCRIPT_SOCKET" in os.environ:
+        return Path(os.environ["SUPERSCRIPT_SOCKET"])
+    # same location as typer.get_app_dir("superscript") on posix systems
+    configpath = os.environ.get("XDG_CONFIG_HOME", os.path.expanduser("~/.config"))
+    return Path(configpath) / "superscript" / DAEMON_SOCKET
+
+
+def get_subcommand(argv):
+    skip = False
+    for argument in argv:
+        if skip:
+            skip = False
+        elif argument in VALUE_OPTIONS:
+            skip = True
+        elif not argument.startswith("-"):
+            return argument
+    return None
+
+
+class SocketWriter(io.TextIOBase):
+    """
+    Text stream which forwards everything written to it as json lines to the client.
+    """
+    def __init__(self, connection, stream):
+        self.connection = connection
+        self.stream = stream
+
+    def writable(self):
+        return True
+
+    def isatty(self):
+        return False
+
+    @property
+    def encoding(self):
+        return "utf-8"
+
+    def write(self, content):
+        if isinstance(content, bytes):
+            content = content.decode(self.encoding, "replace")
+        if content:
+            self.connection.sendall((json.dumps({self.stream: content}) + "\n").encode())
+        return len(content)
+
+
+def forward(argv, socketpath=None):
+    """
+    Forwards the command line to a running daemon and relays its output.
+
+    Returns the exit code of the command or None if no daemon is reachable, then the command has to run in-process.
+    """
+    subcommand = get_subcommand(argv)
+    # without subcommand the config is initialized, which asks before overwriting
+    if not hasattr(socket, "AF_UNIX") or subcommand is None or subcommand in IN_PROCESS_COMMANDS:
+        return None
+    socketpath = socketpath or get_socketpath()
+    if not socketpath.exists():
+        return None
+    connection = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        connection.connect(str(socketpath))
+    except OSError:
+        connection.close()
+        return None
+    env = {key: value for key, value in os.environ.items() if key.startswith(FORWARDED_ENV_PREFIXES)}
+    # rich reads COLUMNS on every print, so the daemon renders for the width of the client terminal
+    env["COLUMNS"] = str(shutil.get_terminal_size().columns)
+    request = {"argv": argv, "cwd": os.getcwd(), "env": env}
+    exitcode = 1
+    with connection:
+        connection.sendall((json.dumps(request) + "\n").encode())
+        # the daemon has no access to the terminal, prompts will read EOF and abort
+        connection.shutdown(socket.SHUT_WR)
+        for line in connection.makefile("r", encoding="utf-8"):
+            message = json.loads(line)
+            if "stdout" in message:
+                sys.stdout.write(message["stdout"])
+                sys.stdout.flush()
+            elif "stderr" in message:
+                sys.stderr.write(message["stderr"])
+                sys.stderr.flush()
+            elif "exit" in message:
+                exitcode = message["exit"]
+    return exitcode
+
+
+def run_request(command, request, prog_name):
+    """
+    Runs one forwarded command line with the already loaded click command and returns the exit code.
+    """
+    import click
+
+    os.chdir(request.get("cwd", os.getcwd()))
+    previous_env = {key: os.environ.get(key) for key in request.get("env", {})}
+    os.environ.update(request.get("env", {}))
+    try:
+        return command.main(args=request["argv"], prog_name=prog_name, standalone_mode=False) or 0
+    except click.exceptions.ClickException as e:
+        e.show()
+        return e.exit_code
+    except click.exceptions.Abort:
+        click.echo("Aborted!", err=True)
+        return 1
+    except SystemExit as e:
+        return e.code if isinstance(e.code, int) else 0
+    except Exception:
+        traceback.print_exc()
+        return 1
+    finally:
+        for key, value in previous_env.items():
+            if value is None:
+                os.environ.pop(key, None)
+            else:
+                os.environ[key] = value
+
+
+def serve(command, socketpath=None, prog_name="superscript", before_request=None):
+    """
+    Serves forwarded command lines one after another on a unix socket until interrupted.
+
+    The commands share the module state of the daemon process, e.g. the parsed config and open HTTP connections.
+    """
+    socketpath = socketpath or get_socketpath()
+    if socketpath.exists():
+        socketpath.unlink()
+    server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    server.bind(str(socketpath))
+    os.chmod(str(socketpath), 0o600)
+    server.listen()
+    workdir = os.getcwd()
+    try:
+        while True:
+            connection, _ = server.accept()
+            with connection:
+                try:
+                    request = json.loads(connection.makefile("r", encoding="utf-8").readline())
+                except ValueError:
+                    continue
+                if before_request:
+                    before_request()
+                stdout = SocketWriter(connection, "stdout")
+                stderr = SocketWriter(connection, "stderr")
+                stdin = sys.stdin
+                sys.stdin = io.StringIO("")
+                try:
+                    with redirect_stdout(stdout), redirect_stderr(stderr):
+                        exitcode = run_request(command, request, prog_name)
+                    connection.sendall((json.dumps({"exit": exitcode}) + "\n").encode())
+                except OSError:
+                    # client went away while the command was running
+                    pass
+                finally:
+                    sys.stdin = stdin
+                    os.chdir(workdir)
+    finally:
+        server.close()
+        if socketpath.exists():
+            socketpath.unlink()
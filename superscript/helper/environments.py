@@ -0,0 +1,192 @@
+import os
+import sys
+import hashlib
+import subprocess
+import sysconfig
+import tempfile
+import threading
+import venv
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from constants import REQUIREMENTS, REQUIREMENTS_MARKER
+from fshandling import check_path_create
+from printing import write_verbose
+
+# identical requirement sets are built once, different ones in parallel
+wheel_locks = {}
+wheel_locks_lock = threading.Lock()
+
+
+def get_envpath(venvpath: Path, toolname):
+    return Path(venvpath) / toolname
+
+
+def get_envbin(envpath: Path):
+    return Path(envpath) / ("Scripts" if os.name == "nt" else "bin")
+
+
+def get_envpython(envpath: Path):
+    return get_envbin(envpath) / ("python.exe" if os.name == "nt" else "python")
+
+
+def get_sitepackages(envpath: Path):
+    return Path(sysconfig.get_path("purelib", vars={"base": str(envpath), "platbase": str(envpath)}))
+
+
+def get_wheel_lock(requirements: Path):
+    key = hashlib.sha256(Path(requirements).read_bytes()).hexdigest()
+    with wheel_locks_lock:
+        return wheel_locks.setdefault(key, threading.Lock())
+
+
+def build_wheels(requirements: Path, wheelcache: Path):
+    """
+    Builds or downloads the wheels of a requirements file into the shared wheel cache.
+
+    Wheels already in the cache are picked up via find-links and not built again.
+    Each build writes into its own directory, the finished wheels are moved into the cache atomically.
+    """
+    with get_wheel_lock(requirements):
+        write_verbose(f"Building wheels for {requirements} into {wheelcache}")
+        with tempfile.TemporaryDirectory(prefix=".build-", dir=str(wheelcache)) as builddir:
+            subprocess.run(
+                [
+                    sys.executable, "-m", "pip", "wheel", "--quiet",
+                    "--wheel-dir", builddir,
+                    "--find-links", str(wheelcache),
+                    "--requirement", str(requirements)
+                ],
+                check=True
+            )
+            for wheel in Path(builddir).iterdir():
+                os.replace(wheel, Path(wheelcache) / wheel.name)
+
+
+def hardlink_site_packages(envpath: Path, sitestore: Path):
+    """
+    Replaces the files in the site-packages of an environment by hardlinks into a content addressed store.
+
+    Identical files of different environments then share the same inode. Files on another device are left untouched.
+    """
+    linked = 0
+    for sitefile in get_sitepackages(envpath).rglob("*"):
+        if not sitefile.is_file() or sitefile.is_symlink():
+            continue
+        digest = hashlib.sha256(sitefile.read_bytes()).hexdigest()
+        storefile = sitestore / digest[:2] / digest
+        try:
+            if storefile.is_file():
+                if os.path.samefile(storefile, sitefile):
+                    continue
+                tmpfile = sitefile.with_name(sitefile.name + ".superscript")
+                os.link(storefile, tmpfile)
+                os.replace(tmpfile, sitefile)
+                linked += 1
+            else:
+                storefile.parent.mkdir(parents=True, exist_ok=True)
+                os.link(sitefile, storefile)
+        except OSError:
+            # different filesystem or no hardlink support, keep the copy
+            continue
+    write_verbose(f"Hardlinked {linked} files of {envpath} into {sitestore}")
+    return linked
+
+
+def get_requirementshash(requirements: Path):
+    return hashlib.sha256(requirements.read_bytes()).hexdigest() if requirements.is_file() else ""
+
+
+def is_environment_current(envpath: Path, requirements: Path):
+    try:
+        marker = (Path(envpath) / REQUIREMENTS_MARKER).read_text()
+    except OSError:
+        return False
+    return get_envpython(envpath).is_file() and marker == get_requirementshash(requirements)
+
+
+def create_environment(toolpath: Path, envpath: Path, wheelcache: Path, sitestore: Path, recreate=False):
+    """
+    Creates the virtualenv of a tool and installs its requirements from the shared wheel cache only.
+
+    An environment counts as done only if the marker matches the current requirements,
+    so a failed install is retried and changed requirements are installed on the next run.
+    """
+    requirements = Path(toolpath) / REQUIREMENTS
+    markerpath = Path(envpath) / REQUIREMENTS_MARKER
+    if is_environment_current(envpath, requirements) and not recreate:
+        write_verbose(f"Environment {envpath} already exists")
+        return envpath
+    if not get_envpython(envpath).is_file() or recreate:
+        check_path_create(Path(envpath).parent)
+        write_verbose(f"Creating environment {envpath}")
+        venv.EnvBuilder(with_pip=True, clear=True, symlinks=os.name != "nt").create(str(envpath))
+    else:
+        write_verbose(f"Requirements of {envpath} changed or were not installed completely")
+    markerpath.unlink(missing_ok=True)
+    if requirements.is_file():
+        build_wheels(requirements, wheelcache)
+        subprocess.run(
+            [
+                str(get_envpython(envpath)), "-m", "pip", "install", "--quiet",
+                "--no-index",
+                "--find-links", str(wheelcache),
+                "--requirement", str(requirements)
+            ],
+            check=True,
+            cwd=str(toolpath)
+        )
+        hardlink_site_packages(envpath, sitestore)
+    markerpath.write_text(get_requirementshash(requirements))
+    return envpath
+
+
+def create_environments(tools, venvpath: Path, wheelcache: Path, sitestore: Path, workers=4, recreate=False):
+    """
+    Creates the environments of multiple tools in parallel.
+
+    Takes a dict of toolname to toolpath and returns a dict of toolname to the raised exception or None on success.
+    """
+    check_path_create(Path(venvpath))
+    check_path_create(Path(wheelcache))
+    check_path_create(Path(sitestore))
+    results = {}
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = {
+            toolname: executor.submit(
+                create_environment,
+                toolpath,
+                get_envpath(venvpath, toolname),
+                wheelcache,
+                sitestore,
+                recreate
+            )
+            for toolname, toolpath in tools.items()
+        }
+        for toolname, future in futures.items():
+            try:
+                future.result()
+                results[toolname] = None
+            except (OSError, subprocess.CalledProcessError) as e:
+                results[toolname] = e
+    return results
+
+
+def execute_in_environment(envpath: Path, toolpath: Path, arguments, chdir=True):
+    """
+    Replaces the current process by the given command running inside the environment of a tool.
+
+    With chdir the command runs in the tool directory, relative paths in the arguments then refer to it.
+    """
+    environment = dict(os.environ)
+    environment["VIRTUAL_ENV"] = str(envpath)
+    environment["PATH"] = str(get_envbin(envpath)) + os.pathsep + environment.get("PATH", "")
+    environment.pop("PYTHONHOME", None)
+    if not arguments:
+        arguments = [str(get_envpython(envpath))]
+    if chdir:
+        os.chdir(str(toolpath))
+    if os.name == "nt":
+        # exec on windows spawns a detached child, so wait for the command instead
+        raise SystemExit(subprocess.call(arguments, env=environment))
+    os.execvpe(arguments[0], arguments, environment)
@@ -0,0 +1,105 @@
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import git
+
+from constants import GITENDING
+from printing import write_verbose
+
+
+def get_dirsize(path: Path):
+    size = 0
+    try:
+        with os.scandir(path) as entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    size += get_dirsize(entry.path)
+                elif entry.is_file(follow_symlinks=False):
+                    size += entry.stat(follow_symlinks=False).st_size
+    except OSError:
+        pass
+    return size
+
+
+def format_size(size):
+    for unit in ("B", "KiB", "MiB", "GiB"):
+        if abs(size) < 1024:
+            return f"{size:.1f} {unit}" if unit != "B" else f"{size} {unit}"
+        size /= 1024
+    return f"{size:.1f} TiB"
+
+
+def maintain_repository(toolpath: Path, aggressive=False, iolock=None):
+    """
+    Runs gc with repack and prune of unreachable objects on a git repository.
+
+    Returns the size of the git directory before and after.
+    """
+    gitpath = Path(toolpath) / GITENDING
+    if not gitpath.is_dir():
+        raise FileNotFoundError(f"No git repository found in {toolpath}")
+    # the semaphore bounds the repositories being rewritten at the same time, independent from the workers
+    with iolock or threading.Semaphore():
+        before = get_dirsize(gitpath)
+        write_verbose(f"Running gc in {toolpath}")
+        repo = git.Repo(str(toolpath))
+        arguments = ["--prune=now", "--quiet"]
+        if aggressive:
+            arguments.append("--aggressive")
+        repo.git.gc(*arguments)
+        repo.close()
+        after = get_dirsize(gitpath)
+    return before, after
+
+
+def maintain_repositories(tools, workers=4, iolimit=None, aggressive=False):
+    """
+    Runs the maintenance of multiple repositories on a bounded worker pool.
+
+    Takes a dict of toolname to toolpath and returns a dict of toolname to (before, after, error).
+    """
+    iolock = threading.BoundedSemaphore(iolimit) if iolimit else None
+    results = {}
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = {
+            toolname: executor.submit(maintain_repository, toolpath, aggressive, iolock)
+            for toolname, toolpath in tools.items()
+        }
+        for toolname, future in futures.items():
+            try:
+                before, after = future.result()
+                results[toolname] = (before, after, None)
+            except (OSError, git.GitError) as e:
+                results[toolname] = (None, None, e)
+    return results
+
+
+def find_orphans(basepath: Path, toolpaths):
+    """
+    Returns the directories under the base path which belong to no tool, e.g. left over after removing a tool.
+
+    Directories on the way to a tool, like category folders, are searched but not reported.
+    """
+    basepath = Path(basepath).resolve()
+    known = set()
+    ancestors = set()
+    for toolpath in toolpaths:
+        toolpath = Path(toolpath).resolve()
+        known.add(toolpath)
+        ancestors.update(toolpath.parents)
+    orphans = []
+    searchpaths = [basepath]
+    while searchpaths:
+        searchpath = searchpaths.pop()
+        if not searchpath.is_dir():
+            continue
+        for child in sorted(searchpath.iterdir()):
+            if not child.is_dir() or child in known:
+                continue
+            if child in ancestors:
+                searchpaths.append(child)
+            else:
+                orphans.append(child)
+    return sorted(orphans)
@@ -0,0 +1,104 @@
+import io
+import re
+import hashlib
+from pathlib import Path
+
+from rich.console import Console
+from rich.markdown import Markdown
+
+from fshandling import check_path_create
+from printing import write_verbose
+
+HEADING_BLUEPRINT = re.compile(r"^ {0,3}(?P<level>#{1,6})\s+(?P<title>.*?)\s*#*\s*$")
+FENCE_BLUEPRINT = re.compile(r"^ {0,3}(```|~~~)")
+
+
+def extract_section(content, section):
+    """
+    Returns the heading matching the section with everything below it up to the next heading of the same level.
+
+    Headings inside fenced code blocks are ignored, None if no heading matches.
+    """
+    lines = content.splitlines(keepends=True)
+    section = section.lower()
+    start = None
+    level = None
+    infence = False
+    for i, line in enumerate(lines):
+        if FENCE_BLUEPRINT.match(line):
+            infence = not infence
+            continue
+        if infence:
+            continue
+        heading = HEADING_BLUEPRINT.match(line)
+        if not heading:
+            continue
+        if start is None:
+            if section in heading.group('title').lower():
+                start = i
+                level = len(heading.group('level'))
+        elif len(heading.group('level')) <= level:
+            return "".join(lines[start:i])
+    if start is None:
+        return None
+    return "".join(lines[start:])
+
+
+def get_cachekey(value):
+    return hashlib.sha256(value.encode()).hexdigest()[:16]
+
+
+def get_rendercachepath(cachefolder: Path, markdownpath: Path, width, color, section=None):
+    # the name starts with the file and its version, so outdated renderings of the same file can be found
+    stat = markdownpath.stat()
+    pathkey = get_cachekey(str(markdownpath.resolve()))
+    versionkey = get_cachekey(f"{stat.st_mtime_ns}:{stat.st_size}")
+    variantkey = get_cachekey(f"{width}:{color}:{section}")
+    return cachefolder / f"{pathkey}-{versionkey}-{variantkey}.txt"
+
+
+def evict_renderings(cachepath: Path):
+    """
+    Removes the cached renderings of older versions of the same file, other widths and sections are kept.
+    """
+    pathkey, versionkey, _ = cachepath.stem.split("-")
+    for cached in cachepath.parent.glob(f"{pathkey}-*.txt"):
+        if cached.stem.split("-")[1] != versionkey:
+            write_verbose(f"Removing outdated rendering {cached}")
+            cached.unlink(missing_ok=True)
+
+
+def render_markdown(markdownpath: Path, cachefolder: Path, width, color=True, section=None):
+    """
+    Renders a markdown file for the console and caches the output by path, mtime, width and section.
+
+    Writing a rendering of a changed file drops the renderings of its previous versions.
+    Returns the path of the cached output or None if the section does not exist.
+    """
+    cachepath = get_rendercachepath(cachefolder, markdownpath, width, color, section)
+    if cachepath.is_file():
+        write_verbose(f"Using cached rendering {cachepath}")
+        return cachepath
+    content = markdownpath.read_text()
+    if section:
+        content = extract_section(content, section)
+        if content is None:
+            return None
+    write_verbose(f"Rendering {markdownpath} with width {width}")
+    output = io.StringIO()
+    Console(file=output, width=width, force_terminal=color, no_color=not color).print(Markdown(content))
+    check_path_create(cachefolder)
+    evict_renderings(cachepath)
+    tmppath = cachepath.with_name(cachepath.name + ".tmp")
+    tmppath.write_text(output.getvalue())
+    tmppath.replace(cachepath)
+    return cachepath
+
+
+def read_chunks(path: Path, size=64 * 1024):
+    with open(path, 'r') as f:
+        while True:
+            chunk = f.read(size)
+            if not chunk:
+                break
+            yield chunk
@@ -0,0 +1,261 @@
+import os
+import re
+import json
+import time
+import random
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from urllib.parse import urlparse
+
+import git
+import requests
+
+from constants import GITENDING, GITDEFAULTBRANCH, TYPES, SCHEDULE_INTERVALS, SCHEDULE_JITTER, \
+    RATE_BUDGETS, BACKOFF_START, BACKOFF_MAX
+from printing import write_verbose
+from versioning import Version
+
+GITHUB_API = "https://api.github.com/repos/{}/releases/latest"
+GITSSH_HOST = re.compile(r"^[-\w.]+@(?P<host>[-\w.]+):")
+
+
+class RateLimitExceeded(Exception):
+    def __init__(self, host, retry_after=None):
+        super().__init__(f"Rate limit of {host} exceeded")
+        self.host = host
+        self.retry_after = retry_after
+
+
+class RateLimiter:
+    """
+    Token bucket per host with exponential backoff after the host refused requests.
+
+    Never blocks, a component whose host has no budget left is checked in a later round.
+    """
+    def __init__(self, budgets=None):
+        self.budgets = {}
+        self.update_budgets(budgets)
+        self.tokens = {}
+        self.updated = {}
+        self.backoff = {}
+        self.blocked_until = {}
+        self.lock = threading.Lock()
+
+    def update_budgets(self, budgets=None):
+        # the tokens left are kept, a changed budget applies from the next refill
+        self.budgets = dict(RATE_BUDGETS, **(budgets or {}))
+
+    def acquire(self, host, count=1):
+        """
+        Takes the tokens for count requests at once, a check never stops halfway for lack of budget.
+
+        More requests than the capacity take the whole bucket, otherwise the check could never run.
+        """
+        with self.lock:
+            now = time.time()
+            if self.blocked_until.get(host, 0) > now:
+                return False
+            capacity, period = self.budgets.get(host, self.budgets["default"])
+            count = min(count, capacity)
+            tokens = self.tokens.get(host, capacity)
+            tokens = min(capacity, tokens + (now - self.updated.get(host, now)) * capacity / period)
+            self.updated[host] = now
+            if tokens < count:
+                self.tokens[host] = tokens
+                return False
+            self.tokens[host] = tokens - count
+            return True
+
+    def success(self, host):
+        with self.lock:
+            self.backoff.pop(host, None)
+
+    def penalize(self, host, retry_after=None):
+        with self.lock:
+            backoff = min(self.backoff.get(host, BACKOFF_START / 2) * 2, BACKOFF_MAX)
+            self.backoff[host] = backoff
+            self.blocked_until[host] = time.time() + max(backoff, retry_after or 0)
+            write_verbose(f"Backing off from {host} for {int(self.blocked_until[host] - time.time())} seconds")
+
+
+def get_host(url):
+    sshmatch = GITSSH_HOST.match(url)
+    if sshmatch:
+        return sshmatch.group('host')
+    return urlparse(url).hostname or url
+
+
+def get_github_userrepo(url):
+    path = urlparse(url).path if "://" in url else url.split(":", 1)[-1]
+    return "/".join(path.strip("/").replace(GITENDING, "").split("/")[:2])
+
+
+def check_response(response, host):
+    if response.status_code == 429 or (response.status_code == 403 and response.headers.get("X-RateLimit-Remaining") == "0"):
+        retry_after = response.headers.get("Retry-After")
+        if retry_after is None and "X-RateLimit-Reset" in response.headers:
+            retry_after = int(response.headers["X-RateLimit-Reset"]) - time.time()
+        raise RateLimitExceeded(host, float(retry_after) if retry_after else None)
+
+
+def check_git(toolconfig, toolpath, session):
+    branch = toolconfig.get("branch", GITDEFAULTBRANCH)
+    remote = git.cmd.Git().ls_remote(toolconfig["url"], f"refs/heads/{branch}")
+    if not remote:
+        raise LookupError(f"Branch {branch} not found on remote")
+    latest = remote.split()[0]
+    current = git.Repo(str(toolpath)).head.commit.hexsha if (Path(toolpath) / GITENDING).is_dir() else None
+    return {"current": current, "latest": latest, "outdated": current != latest}
+
+
+def check_gitrelease(toolconfig, toolpath, session):
+    host = get_host(GITHUB_API)
+    response = session.get(GITHUB_API.format(get_github_userrepo(toolconfig["url"])), timeout=30)
+    check_response(response, host)
+    response.raise_for_status()
+    latest = response.json()["tag_name"]
+    current = toolconfig.get("version")
+    outdated = current is None or Version.from_tag(latest) != Version.from_tag(str(current))
+    return {"current": current, "latest": latest, "outdated": outdated}
+
+
+def get_next_urls(url, version):
+    """
+    Builds the URLs of the next fix, minor and major version by replacing the numbers in the filename.
+    """
+    base, filename = url.rsplit("/", 1)
+    numbers = list(re.finditer(r"[0-9]+", filename))
+    if not version or len(numbers) < 3:
+        return []
+    major, minor, fix = numbers[-3:]
+    candidates = [
+        (int(major.group()), int(minor.group()), int(fix.group()) + 1),
+        (int(major.group()), int(minor.group()) + 1, 0),
+        (int(major.group()) + 1, 0, 0)
+    ]
+    urls = []
+    for candidate in candidates:
+        nextname = filename
+        for match, number in reversed(list(zip((major, minor, fix), candidate))):
+            nextname = nextname[:match.start()] + str(number) + nextname[match.end():]
+        urls.append(f"{base}/{nextname}")
+    return urls
+
+
+def check_urlfile(toolconfig, toolpath, session):
+    host = get_host(toolconfig["url"])
+    for nexturl in get_next_urls(toolconfig["url"], toolconfig.get("version")):
+        response = session.head(nexturl, allow_redirects=True, timeout=30)
+        check_response(response, host)
+        if response.status_code == 200:
+            return {"current": toolconfig["url"], "latest": nexturl, "outdated": True}
+    response = session.head(toolconfig["url"], allow_redirects=True, timeout=30)
+    check_response(response, host)
+    response.raise_for_status()
+    return {"current": toolconfig["url"], "latest": toolconfig["url"], "outdated": False}
+
+
+def get_request_count(toolconfig):
+    # a urlfile check probes every next version before the file itself
+    if toolconfig["type"] == TYPES["urlfile"]:
+        return len(get_next_urls(toolconfig["url"], toolconfig.get("version"))) + 1
+    return 1
+
+
+CHECKS = {
+    TYPES["git"]: check_git,
+    TYPES["gitrelease"]: check_gitrelease,
+    TYPES["urlfile"]: check_urlfile
+}
+
+
+def load_state(path: Path):
+    try:
+        with open(path, 'r') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def save_state(path: Path, state):
+    # replace atomically, list and status may read the file at any time
+    tmppath = path.with_name(path.name + ".tmp")
+    with open(tmppath, 'w+') as f:
+        f.write(json.dumps(state, indent=2))
+    os.replace(tmppath, path)
+
+
+def get_next_check(toolstate, interval, jitter=SCHEDULE_JITTER):
+    if not toolstate or "checked" not in toolstate:
+        return 0
+    return toolstate["checked"] + interval * (1 + toolstate.get("jitter", 0) * jitter)
+
+
+def check_component(toolname, toolconfig, toolpath, session, limiter):
+    if toolconfig["type"] == TYPES["gitrelease"]:
+        host = get_host(GITHUB_API)
+    else:
+        host = get_host(toolconfig["url"])
+    if not limiter.acquire(host, get_request_count(toolconfig)):
+        write_verbose(f"No request budget left for {host}, postponing {toolname}")
+        return None
+    result = {"type": toolconfig["type"], "host": host, "checked": time.time(), "jitter": random.uniform(-1, 1)}
+    try:
+        result.update(CHECKS[toolconfig["type"]](toolconfig, toolpath, session))
+        result["error"] = None
+        limiter.success(host)
+    except RateLimitExceeded as e:
+        limiter.penalize(host, e.retry_after)
+        return None
+    except (requests.ConnectionError, requests.Timeout) as e:
+        result["error"] = str(e)
+        limiter.penalize(host)
+    except requests.HTTPError as e:
+        result["error"] = str(e)
+        # only a failing server needs a break, a missing or private repository stays that way
+        if e.response is not None and e.response.status_code >= 500:
+            limiter.penalize(host)
+    except Exception as e:
+        result["error"] = str(e)
+    return result
+
+
+def run_checks(tools, statepath: Path, session, limiter, intervals=None, workers=4, force=False):
+    """
+    Runs the update checks of all due components and stores the results in the state file.
+
+    Takes a dict of toolname to (toolconfig, toolpath) and returns the seconds until the next check is due.
+    """
+    intervals = dict(SCHEDULE_INTERVALS, **(intervals or {}))
+    state = load_state(statepath)
+    now = time.time()
+    due = {
+        toolname: (toolconfig, toolpath)
+        for toolname, (toolconfig, toolpath) in tools.items()
+        if toolconfig.get("type") in CHECKS and toolconfig.get("url")
+        and (force or get_next_check(state.get(toolname), intervals[toolconfig["type"]]) <= now)
+    }
+    if due:
+        write_verbose(f"Checking {len(due)} components for updates")
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = {
+                toolname: executor.submit(check_component, toolname, toolconfig, toolpath, session, limiter)
+                for toolname, (toolconfig, toolpath) in due.items()
+            }
+            for toolname, future in futures.items():
+                result = future.result()
+                if result:
+                    state[toolname] = result
+        # drop components which were removed from the config
+        state = {toolname: toolstate for toolname, toolstate in state.items() if toolname in tools}
+        save_state(statepath, state)
+    next_checks = [
+        get_next_check(state.get(toolname), intervals[toolconfig["type"]])
+        for toolname, (toolconfig, _) in tools.items()
+        if toolconfig.get("type") in CHECKS and toolconfig.get("url")
+    ]
+    if not next_checks:
+        return None
+    # postponed components are retried after a minute
+    return max(min(next_checks) - time.time(), 60)
@@ -0,0 +1,187 @@
+import os
+import json
+import hashlib
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import git
+
+from constants import GITENDING, GITDEFAULTBRANCH, TYPES
+from printing import write_verbose
+
+MISSING = "missing"
+REMOTE = "remote"
+BRANCH = "branch"
+HASH = "hash"
+NOHASH = "nohash"
+
+
+class IntegrityError(Exception):
+    pass
+
+
+def get_filehash(path: Path):
+    filehash = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            filehash.update(chunk)
+    return filehash.hexdigest()
+
+
+def get_fingerprint(toolconfig, toolpath: Path):
+    """
+    Cheap fingerprint of a component from its config entry and the mtime of HEAD and git config or the file.
+
+    A component with an unchanged fingerprint keeps its last verification result.
+    """
+    parts = [json.dumps(toolconfig, sort_keys=True, default=str)]
+    if toolconfig["type"] == TYPES["git"]:
+        statpaths = [toolpath / GITENDING / "HEAD", toolpath / GITENDING / "config"]
+    else:
+        statpaths = [toolpath]
+    for statpath in statpaths:
+        try:
+            stat = statpath.stat()
+            parts.append(f"{statpath}:{stat.st_mtime_ns}:{stat.st_size}")
+        except OSError:
+            parts.append(f"{statpath}:{MISSING}")
+    return hashlib.sha256("\n".join(parts).encode()).hexdigest()
+
+
+def verify_git(toolconfig, toolpath: Path):
+    if not (toolpath / GITENDING).is_dir():
+        return [[MISSING, f"No git repository at {toolpath}"]]
+    issues = []
+    repo = git.Repo(str(toolpath))
+    try:
+        remoteurl = repo.remote().url
+    except ValueError:
+        remoteurl = None
+    if remoteurl != toolconfig["url"]:
+        issues.append([REMOTE, f"Remote is {remoteurl} instead of {toolconfig['url']}"])
+    branch = toolconfig.get("branch", GITDEFAULTBRANCH)
+    activebranch = None if repo.head.is_detached else repo.active_branch.name
+    if activebranch != branch:
+        issues.append([BRANCH, f"Branch is {activebranch} instead of {branch}"])
+    repo.close()
+    return issues
+
+
+def verify_urlfile(toolconfig, filepath: Path):
+    if not filepath.is_file():
+        return [[MISSING, f"No file at {filepath}"]]
+    if "sha256" not in toolconfig:
+        return [[NOHASH, "No hash in config to compare with"]]
+    filehash = get_filehash(filepath)
+    if filehash != toolconfig["sha256"]:
+        return [[HASH, f"Hash is {filehash} instead of {toolconfig['sha256']}"]]
+    return []
+
+
+def verify_component(toolconfig, toolpath: Path):
+    if toolconfig["type"] == TYPES["git"]:
+        return verify_git(toolconfig, toolpath)
+    if toolconfig["type"] == TYPES["urlfile"]:
+        return verify_urlfile(toolconfig, toolpath)
+    return []
+
+
+def load_verifycache(path: Path):
+    try:
+        with open(path, 'r') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def save_verifycache(path: Path, verifycache):
+    tmppath = path.with_name(path.name + ".tmp")
+    with open(tmppath, 'w+') as f:
+        f.write(json.dumps(verifycache))
+    os.replace(tmppath, path)
+
+
+def verify_components(tools, cachepath: Path, workers=8, full=False, prune=True):
+    """
+    Verifies the components concurrently, only components whose fingerprint changed are inspected again.
+
+    Takes a dict of toolname to (toolconfig, path) and returns a dict of toolname to a list of [issue, message].
+    The results are merged into the cache, with prune the cached tools not passed in are dropped.
+    """
+    verifycache = load_verifycache(cachepath)
+    results = {}
+    fingerprints = {}
+    changed = {}
+    for toolname, (toolconfig, toolpath) in tools.items():
+        fingerprints[toolname] = get_fingerprint(toolconfig, toolpath)
+        cached = verifycache.get(toolname)
+        if not full and cached and cached["fingerprint"] == fingerprints[toolname]:
+            results[toolname] = cached["issues"]
+        else:
+            changed[toolname] = (toolconfig, toolpath)
+    write_verbose(f"Verifying {len(changed)} components, {len(results)} unchanged since the last run")
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = {
+            toolname: executor.submit(verify_component, toolconfig, toolpath)
+            for toolname, (toolconfig, toolpath) in changed.items()
+        }
+        for toolname, future in futures.items():
+            try:
+                results[toolname] = future.result()
+            except (OSError, git.GitError) as e:
+                results[toolname] = [[MISSING, str(e)]]
+    if prune:
+        verifycache = {}
+    verifycache.update({
+        toolname: {"fingerprint": fingerprints[toolname], "issues": issues}
+        for toolname, issues in results.items()
+    })
+    save_verifycache(cachepath, verifycache)
+    return results
+
+
+def repair_component(toolconfig, toolpath: Path, issues, session):
+    """
+    Brings a component on disk in line with its config entry.
+
+    Returns the config fields to update, e.g. the hash of a downloaded file.
+    """
+    codes = [code for code, _ in issues]
+    update = {}
+    if toolconfig["type"] == TYPES["git"]:
+        branch = toolconfig.get("branch", GITDEFAULTBRANCH)
+        if MISSING in codes:
+            write_verbose(f"Cloning {toolconfig['url']} into {toolpath}")
+            repo = git.Repo.clone_from(toolconfig["url"], str(toolpath), branch=branch)
+            if toolconfig.get("recursive"):
+                repo.submodule_update(recursive=True)
+            repo.close()
+            return update
+        repo = git.Repo(str(toolpath))
+        if REMOTE in codes:
+            try:
+                repo.remote().set_url(toolconfig["url"])
+            except ValueError:
+                repo.create_remote("origin", toolconfig["url"])
+        if BRANCH in codes:
+            if branch not in repo.heads:
+                repo.remote().fetch(branch)
+            repo.git.checkout(branch)
+        repo.close()
+    elif toolconfig["type"] == TYPES["urlfile"]:
+        if MISSING in codes or HASH in codes:
+            write_verbose(f"Downloading {toolconfig['url']} to {toolpath}")
+            response = session.get(toolconfig["url"], timeout=60)
+            response.raise_for_status()
+            filehash = hashlib.sha256(response.content).hexdigest()
+            # a recorded hash is the reference, never accept what the server delivers now instead
+            if "sha256" in toolconfig and filehash != toolconfig["sha256"]:
+                raise IntegrityError(
+                    f"Downloaded file has hash {filehash} instead of the recorded {toolconfig['sha256']}"
+                )
+            toolpath.parent.mkdir(parents=True, exist_ok=True)
+            with open(toolpath, "wb+") as downloadfile:
+                downloadfile.write(response.content)
+        if "sha256" not in toolconfig:
+            update["sha256"] = get_filehash(toolpath)
+    return update
@@ -1,21 +1,81 @@
 import re
+from functools import total_ordering
 
+VERSION_BLUEPRINT = re.compile(
+    r"[vV]?(?P<major>[0-9]+)[.,_-]?(?P<minor>[0-9]*)[.,_-]?(?P<fix>[0-9]*)"
+    r"(?:[.,_+-]?(?P<prerelease>[a-zA-Z][0-9a-zA-Z.]*))?")
+# tags may carry a name prefix, e.g. release-1.2.0 or tool_v1.2
+# never start behind a digit and separator, otherwise v1.0.0-beta-2 could be read as 2
+# the suffix may contain hyphens, e.g. beta-2, or be numeric after a separator, e.g. the revision 1.2.3-1
+TAG_BLUEPRINT = re.compile(
+    r"(?<![0-9a-zA-Z.])(?<![0-9][-_])[vV]?(?P<major>[0-9]+)(?:\.(?P<minor>[0-9]+))?(?:\.(?P<fix>[0-9]+))?"
+    r"(?:(?:[.+_-]?(?=[a-zA-Z])|[+_-])(?P<prerelease>[0-9a-zA-Z][0-9a-zA-Z.-]*))?$")
+# calendar versioned tags, e.g. 2023-01-15
+DATE_BLUEPRINT = re.compile(r"(?<![0-9])(?P<major>[0-9]{4})-(?P<minor>[0-9]{2})-(?P<fix>[0-9]{2})$")
+# a purely numeric suffix is a revision of the release, e.g. 2.2.0-20220919, not a prerelease
+BUILD_BLUEPRINT = re.compile(r"^[0-9]+(?:[.-][0-9]+)*$")
+IDENTIFIER_BLUEPRINT = re.compile(r"[0-9]+|[a-zA-Z]+")
+CONSTRAINT_BLUEPRINT = re.compile(r"^[vV]?(?P<prefix>[0-9]+(?:\.[0-9]+)*)(?:\.[xX*])?$")
+STABLE_KEYWORDS = ("stable", "release")
+PRERELEASE_KEYWORDS = ("pre", "prerelease", "pre-release", "unstable")
 
+
+@total_ordering
 class Version:
+    __slots__ = ("major", "minor", "fix", "prerelease", "build")
+
     def __init__(self, *args, **kwargs):
         default_version = {
             'major': 0,
             'minor': 0,
-            'fix': 0
+            'fix': 0,
+            'prerelease': "",
+            'build': ""
         }
         if len(args) == 1:
-            default_version = self.convert_versionstring(args[0])
+            default_version = self.match_versionstring(VERSION_BLUEPRINT.match(args[0].strip()), args[0])
         self.major = kwargs.get('major', default_version['major'])
         self.minor = kwargs.get('minor', default_version['minor'])
         self.fix = kwargs.get('fix', default_version['fix'])
+        self.prerelease = kwargs.get('prerelease', default_version['prerelease'])
+        self.build = kwargs.get('build', default_version['build'])
+
+    def __repr__(self):
+        return "Version('{}')".format(self.get_versionstring())
+
+    def __eq__(self, other):
+        if not isinstance(other, Version):
+            return NotImplemented
+        return self.sortkey() == other.sortkey()
+
+    def __lt__(self, other):
+        if not isinstance(other, Version):
+            return NotImplemented
+        return self.sortkey() < other.sortkey()
+
+    def __hash__(self):
+        return hash(self.sortkey())
+
+    def sortkey(self):
+        # a release sorts after all of its prereleases and before its revisions
+        # numbers in the prerelease compare as numbers, so rc10 is newer than rc9 and numbers sort before names
+        prerelease = tuple(
+            (0, int(identifier), "") if identifier.isdigit() else (1, 0, identifier.lower())
+            for identifier in IDENTIFIER_BLUEPRINT.findall(self.prerelease)
+        )
+        build = tuple(int(number) for number in re.findall(r"[0-9]+", self.build))
+        return int(self.major), int(self.minor), int(self.fix), not self.prerelease, prerelease, build
+
+    def is_stable(self):
+        return not self.prerelease
 
     def get_versionstring(self):
-        return "v{}.{}.{}".format(self.major, self.minor, self.fix)
+        versionstring = "v{}.{}.{}".format(self.major, self.minor, self.fix)
+        if self.prerelease:
+            versionstring += "-{}".format(self.prerelease)
+        if self.build:
+            versionstring += "-{}".format(self.build)
+        return versionstring
 
     def next_major(self):
         return int(self.major) + 1
@@ -27,18 +87,18 @@ class Version:
         return int(self.fix) + 1
 
     @staticmethod
-    def convert_versionstring(versionstring):
-        versionstring_regex = re.compile("[vV]?(?P<major>[0-9]+)[.,-_]?(?P<minor>[0-9]*)[.,-_]?(?P<fix>[0-9]*)")
-        version_match = versionstring_regex.match(versionstring.strip())
+    def match_versionstring(version_match, versionstring):
         if not version_match:
-            # TODO: handle error in regex and print versionstring
-            #  with the info that this version conversion is not supported at the moment
-            pass
+            raise ValueError(f"Version conversion of {versionstring} is not supported at the moment")
         version = {
             'major': 0,
             'minor': 0,
-            'fix': 0
+            'fix': 0,
+            'prerelease': version_match.groupdict().get('prerelease') or "",
+            'build': ""
         }
+        if BUILD_BLUEPRINT.match(version['prerelease']):
+            version['prerelease'], version['build'] = "", version['prerelease']
         if version_match.group('major'):
             version['major'] = int(version_match.group('major'))
             if version_match.group('minor'):
@@ -46,3 +106,70 @@ class Version:
                 if version_match.group('fix'):
                     version['fix'] = int(version_match.group('fix'))
         return version
+
+    @staticmethod
+    def convert_versionstring(versionstring):
+        version = Version.match_versionstring(VERSION_BLUEPRINT.match(versionstring.strip()), versionstring)
+        del version['prerelease']
+        del version['build']
+        return version
+
+    @classmethod
+    def from_tag(cls, tagname):
+        """
+        Parses a git tag name, e.g. `refs/tags/v1.2.0^{}` from ls-remote or `tool-1.2.0-rc1` from the releases API.
+
+        Returns None if the tag does not contain a version.
+        """
+        tagname = tagname.strip()
+        if tagname.startswith("refs/tags/"):
+            tagname = tagname[len("refs/tags/"):]
+        if tagname.endswith("^{}"):
+            tagname = tagname[:-len("^{}")]
+        version_match = DATE_BLUEPRINT.search(tagname) or TAG_BLUEPRINT.search(tagname)
+        if not version_match:
+            return None
+        return cls(**cls.match_versionstring(version_match, tagname))
+
+
+def parse_constraint(constraint):
+    """
+    Parses a constraint like "latest stable 2.x" into (stable_only, prefix).
+
+    The prefix is a tuple of the fixed leading version numbers, e.g. (2,) for 2.x, stable is the default.
+    """
+    stable_only = True
+    prefix = ()
+    for word in (constraint or "").lower().split():
+        if word == "latest":
+            continue
+        elif word in STABLE_KEYWORDS:
+            stable_only = True
+        elif word in PRERELEASE_KEYWORDS:
+            stable_only = False
+        else:
+            constraint_match = CONSTRAINT_BLUEPRINT.match(word)
+            if not constraint_match:
+                raise ValueError(f"Version constraint {word} in {constraint} is not supported")
+            prefix = tuple(int(number) for number in constraint_match.group('prefix').split("."))
+    return stable_only, prefix
+
+
+def resolve_tag(tagnames, constraint="latest stable"):
+    """
+    Picks the newest tag name matching the constraint in a single pass over all tag names.
+
+    Returns a tuple of the tag name and its Version, or (None, None) if no tag matches.
+    """
+    stable_only, prefix = parse_constraint(constraint)
+    best_tag, best_version, best_key = None, None, None
+    for tagname in tagnames:
+        version = Version.from_tag(tagname)
+        if version is None or (stable_only and version.prerelease):
+            continue
+        key = version.sortkey()
+        if key[:len(prefix)] != prefix:
+            continue
+        if best_key is None or key > best_key:
+            best_tag, best_version, best_key = tagname, version, key
+    return best_tag, best_version
@@ -0,0 +1,114 @@
+import os
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import git
+import requests
+
+from constants import GITENDING, WIKIENDING, WIKI_TTL
+from printing import write_verbose
+
+WIKIPAGE_ENDINGS = (".md", ".markdown", ".mediawiki", ".rst", ".textile", ".asciidoc", ".org", ".wiki")
+
+
+def get_wikiurl(url):
+    return "{url}/{wikipath}".format(url=url.replace(GITENDING, ""), wikipath="wiki")
+
+
+def get_wikigiturl(url):
+    return url.rstrip("/").replace(GITENDING, "") + WIKIENDING
+
+
+def load_wikicache(path: Path):
+    try:
+        with open(path, 'r') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def save_wikicache(path: Path, wikicache):
+    tmppath = path.with_name(path.name + ".tmp")
+    with open(tmppath, 'w+') as f:
+        f.write(json.dumps(wikicache, indent=2))
+    os.replace(tmppath, path)
+
+
+def check_wiki(wikiurl, session):
+    # returns 200 if the wiki is activated for the repository, 302 if not
+    wikipage = session.get(wikiurl, allow_redirects=False, timeout=30)
+    write_verbose(f"Wiki URL {wikiurl} returned status code {wikipage.status_code}")
+    # anything else, e.g. a rate limit or a server error, says nothing about the wiki and must not be cached
+    if wikipage.status_code not in (200, 302):
+        raise requests.HTTPError(f"Unexpected status code {wikipage.status_code} for {wikiurl}", response=wikipage)
+    return wikipage.status_code == 200
+
+
+def check_wikis(tools, session, cachepath: Path, workers=8, ttl=WIKI_TTL, refresh=False):
+    """
+    Checks the wiki existence of multiple tools concurrently, answers younger than the ttl come from the cache.
+
+    Takes a dict of toolname to repository url and returns a dict of toolname to True, False or the raised exception.
+    """
+    wikicache = load_wikicache(cachepath)
+    now = time.time()
+    results = {}
+    unchecked = {}
+    for toolname, url in tools.items():
+        wikiurl = get_wikiurl(url)
+        cached = wikicache.get(toolname)
+        if not refresh and cached and cached["url"] == wikiurl and now - cached["checked"] < ttl:
+            results[toolname] = cached["exists"]
+        else:
+            unchecked[toolname] = wikiurl
+    if unchecked:
+        write_verbose(f"Checking {len(unchecked)} wikis online, {len(results)} answered from cache")
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = {
+                toolname: executor.submit(check_wiki, wikiurl, session)
+                for toolname, wikiurl in unchecked.items()
+            }
+            for toolname, future in futures.items():
+                try:
+                    results[toolname] = future.result()
+                    wikicache[toolname] = {"url": unchecked[toolname], "exists": results[toolname], "checked": now}
+                except requests.RequestException as e:
+                    results[toolname] = e
+        save_wikicache(cachepath, wikicache)
+    return results
+
+
+def mirror_wiki(url, mirrorpath: Path):
+    """
+    Keeps a shallow clone of the wiki repository, only the latest revision of the pages is fetched.
+    """
+    if (mirrorpath / GITENDING).is_dir():
+        write_verbose(f"Updating wiki mirror {mirrorpath}")
+        repo = git.Repo(str(mirrorpath))
+        repo.remotes.origin.fetch(depth=1)
+        repo.git.reset("--hard", "FETCH_HEAD")
+    else:
+        write_verbose(f"Cloning wiki {get_wikigiturl(url)} into {mirrorpath}")
+        repo = git.Repo.clone_from(get_wikigiturl(url), str(mirrorpath), depth=1)
+    repo.close()
+    return mirrorpath
+
+
+def list_wikipages(mirrorpath: Path):
+    return sorted(
+        wikipage.relative_to(mirrorpath).with_suffix("").as_posix()
+        for wikipage in mirrorpath.rglob("*")
+        if wikipage.suffix.lower() in WIKIPAGE_ENDINGS and GITENDING not in wikipage.parts
+    )
+
+
+def find_wikipage(mirrorpath: Path, pagename):
+    for wikipage in list_wikipages(mirrorpath):
+        if wikipage.lower() == pagename.lower().replace(" ", "-"):
+            for ending in WIKIPAGE_ENDINGS:
+                wikipath = mirrorpath / (wikipage + ending)
+                if wikipath.is_file():
+                    return wikipath
+    return None
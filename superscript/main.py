@@ -5,18 +5,29 @@ from typing import Dict
 from __init__ import __version__
 from helper.settings import Settings
 from helper.constants import APP_NAME, GITDEFAULTBRANCH, TYPES, \
-    UNCATEGORIZED, DEFAULT_CONFIG, GITENDING, URL_BLUEPRINT, GITSSH_BLUEPRINT
+    UNCATEGORIZED, DEFAULT_CONFIG, GITENDING, URL_BLUEPRINT, GITSSH_BLUEPRINT, VENV_FOLDER, WHEEL_CACHE, SITE_STORE, \
+    UPDATE_STATE, WIKI_CACHE, WIKI_FOLDER, RENDER_CACHE, VERIFY_CACHE
 from helper.printing import write_success, write_verbose, write_error, write_info, write_question, write_count
 from helper.versioning import Version
 from helper.fshandling import check_path_create
-from helper.configuration import config_path_adjust, create_config, load_superconfig, save_superconfig
+from helper.configuration import config_path_adjust, create_config, load_superconfig, save_superconfig, \
+    get_superconfig_path, convert_superconfig
+from helper.environments import create_environments, execute_in_environment, get_envpath, get_envpython
+from helper.daemon import get_socketpath, serve
+from helper.completion import complete_category, complete_toolname, read_completion_cache
+from helper.maintenance import maintain_repositories, find_orphans, format_size
+from helper.scheduler import RateLimiter, run_checks, load_state
+from helper.wikis import check_wikis, mirror_wiki, list_wikipages, find_wikipage, get_wikiurl
+from helper.rendering import render_markdown, read_chunks
+from helper.verification import verify_components, repair_component, get_filehash, IntegrityError
 
 from pathlib import Path
 
+import time
+import datetime
 import requests
 import difflib
 from rich.console import Console
-from rich.markdown import Markdown
 
 
 def callback(debug: bool = False):
@@ -34,18 +45,37 @@ app = typer.Typer(
     help="Awesome superscript to dynamically manage your portable software components."
 )
 console = Console()
+# shared between commands, keeps connections open when running as daemon
+session = requests.Session()
 state = {"verbose": False}
 superconfig: Dict | None = None
+# tool to category map of the completion cache, read once per command
+toolcategories: Dict | None = None
 
 
 def get_gitname(giturl):
     return giturl.rstrip("/").split("/")[-1].replace(GITENDING, "")
 
 
+def get_toolcategories():
+    global toolcategories
+    if toolcategories is None:
+        toolcategories = {
+            tool: category
+            for category, tools in read_completion_cache().get("components", {}).items()
+            for tool in tools
+        }
+    return toolcategories
+
+
 def get_toolconfig(toolname):
     global superconfig
     if "components" in superconfig:
-        for category in superconfig["components"].keys():
+        # the completion cache knows the category, so a sharded config reads only that shard
+        category = get_toolcategories().get(toolname)
+        categories = [category] if category in superconfig["components"] else []
+        # fall back to search all categories if the cache is missing or outdated
+        for category in categories + [category for category in superconfig["components"].keys() if category not in categories]:
             if toolname in superconfig["components"][category]:
                 if category == UNCATEGORIZED:
                     return superconfig["components"][category][toolname], None
@@ -55,18 +85,73 @@ def get_toolconfig(toolname):
     return None, None
 
 
-def get_all_tools():
+def get_toolpath(toolname, toolconfig=None, toolcategory=None):
+    # batch commands pass the config and category they already have, everything else looks the tool up
+    if toolconfig is None:
+        toolconfig, toolcategory = get_toolconfig(toolname)
+    if not toolconfig:
+        return None
+    if "custompath" in toolconfig:
+        write_verbose(f"Custom path set for {toolname}")
+        return Path(toolconfig["custompath"])
+    write_verbose(f"Default path used for {toolname}")
+    toolpath = Path(superconfig["config"]["defaultpath"])
+    if toolcategory and toolcategory != UNCATEGORIZED:
+        toolpath = toolpath / toolcategory
+    return toolpath / toolname
+
+
+def get_urlfilepath(toolconfig):
+    basepath = Path(toolconfig.get("custompath", superconfig["config"]["defaultpath"]))
+    return basepath / toolconfig["url"].rsplit("/", 1)[1]
+
+
+def print_markdown(markdownpath, section=None, pager=True):
+    # rendered output is cached, so a known readme is printed without parsing the markdown again
+    cachepath = render_markdown(
+        markdownpath,
+        Path(typer.get_app_dir(APP_NAME)) / RENDER_CACHE,
+        console.width,
+        color=console.is_terminal,
+        section=section
+    )
+    if cachepath is None:
+        write_error(f"No section {section} found in {markdownpath}")
+        raise typer.Exit()
+    if pager and console.is_terminal:
+        typer.echo_via_pager(read_chunks(cachepath))
+    else:
+        for chunk in read_chunks(cachepath):
+            typer.echo(chunk, nl=False)
+
+
+def get_all_tools(category=None):
     global superconfig
     tools = []
     categories = []
     if "components" in superconfig:
-        for category in superconfig["components"].keys():
+        # only read the requested category, a sharded config then loads a single file
+        searchcategories = [category] if category else superconfig["components"].keys()
+        for category in searchcategories:
+            if category not in superconfig["components"] or not superconfig["components"][category]:
+                continue
             for tool in superconfig["components"][category].keys():
                 tools.append(tool)
                 categories.append(category)
     return tools, categories
 
 
+def get_all_toolconfigs(category=None):
+    """
+    Returns a dict of toolname to (toolconfig, category) of all tools, without a lookup per tool.
+    """
+    tools, categories = get_all_tools(category)
+    return {
+        tool: (superconfig["components"][toolcategory][tool], toolcategory)
+        for tool, toolcategory in zip(tools, categories)
+    }
+
+
 def add_component(
     component_name,
     component_url,
@@ -77,7 +162,8 @@ def add_component(
     custompath=None,
     component_type=TYPES["git"],
     category=UNCATEGORIZED,
-    version=None
+    version=None,
+    filehash=None
 ):
     global superconfig
     config_path_adjust("components", category)
@@ -95,6 +181,9 @@ def add_component(
     if version:
         addition[component_name].update({"version": version })
 
+    if filehash:
+        addition[component_name].update({"sha256": filehash})
+
     if "components" in superconfig:
         if category in superconfig["components"] and superconfig["components"][category]:
             write_verbose(f"Category {category} already exists")
@@ -121,6 +210,8 @@ def main(
     """
     Manage portable components in the awesome CLI app.
     """
+    global superconfig, toolcategories
+    toolcategories = None
     if verbose:
         write_verbose("Verbose output activated...")
         state["verbose"] = True
@@ -143,11 +234,12 @@ def main(
     else:
         # TODO: manage to show help of subcommand if config is not initialized
         # TODO: manage to restore from file/url if no config file in place
+        config_path = get_superconfig_path(Path(app_dir))
         if not config_path.is_file():
             write_error("No config file found. First initialize superscript to make it work.")
             raise typer.Exit()
         write_verbose("Config file found")
-        load_superconfig(config_path)
+        superconfig = load_superconfig(config_path)
         # runs script with args normally if config file found
 
 
@@ -156,7 +248,7 @@ def clone(
     giturl: str,
     branch: str = GITDEFAULTBRANCH,
     recursive: bool = False,
-    category: str = UNCATEGORIZED,
+    category: str = typer.Option(UNCATEGORIZED, autocompletion=complete_category),
     subfolder: bool = True,
     custompath: str = None
 ):
@@ -240,7 +332,7 @@ def gitrelease(
     # TODO: get user + repo out of URL
     gituserrepo = giturl
     api_url = "https://api.github.com/repos/{}/releases/latest".format(gituserrepo)
-    releases_page = requests.get(api_url)
+    releases_page = session.get(api_url)
     print(releases_page.content)
     # TODO: check if only packed source code is available as attachment or also some release package
     # TODO: check if it is needed to extract (.zip, .7z, .tar.gz)
@@ -260,11 +352,75 @@ def pip(
     # TODO: if one of both matches execute command with installation
     pass
 
+@app.command()
+def venv(
+    toolname: str = typer.Option(None, autocompletion=complete_toolname),
+    category: str = typer.Option(None, autocompletion=complete_category),
+    workers: int = 4,
+    recreate: bool = False
+):
+    """
+    Creates virtualenvs for git tools, built from a shared local wheel cache.
+
+    Without toolname or category an environment is created for every git tool.
+    """
+    app_dir = Path(typer.get_app_dir(APP_NAME))
+    tools = {}
+    for tool, (toolconfig, toolcategory) in get_all_toolconfigs(category).items():
+        if toolname and tool != toolname:
+            continue
+        if toolconfig["type"] == TYPES["git"]:
+            tools[tool] = get_toolpath(tool, toolconfig, toolcategory)
+    if not tools:
+        write_error("No matching git tool found in superconfig")
+        raise typer.Exit()
+    write_info(f"Creating environments for {len(tools)} tools with {workers} workers")
+    results = create_environments(
+        tools,
+        app_dir / VENV_FOLDER,
+        app_dir / WHEEL_CACHE,
+        app_dir / SITE_STORE,
+        workers=workers,
+        recreate=recreate
+    )
+    for tool, error in results.items():
+        if error:
+            write_error(f"Creating environment for {tool} failed: {error}")
+        else:
+            write_success(f"Environment for {tool} is ready")
+
+
+# everything after the toolname belongs to the command, even options like --help
+@app.command(context_settings={"allow_extra_args": True, "ignore_unknown_options": True, "allow_interspersed_args": False})
+def execute(
+    ctx: typer.Context,
+    toolname: str = typer.Argument(..., autocompletion=complete_toolname),
+    tooldir: bool = typer.Option(True, help="Run in the tool directory, relative paths refer to it then")
+):
+    """
+    Executes a command inside the virtualenv of a tool, e.g. `superscript execute tool python tool.py -h`.
+
+    Without a command the python interpreter of the environment is started.
+    The command runs in the tool directory, use --no-tooldir to pass paths relative to the current directory.
+    Options of execute go before the toolname, everything after it is passed to the command unchanged.
+    """
+    toolpath = get_toolpath(toolname)
+    if not toolpath:
+        write_error(f"Tool {toolname} not found in superconfig")
+        raise typer.Exit()
+    envpath = get_envpath(Path(typer.get_app_dir(APP_NAME)) / VENV_FOLDER, toolname)
+    if not get_envpython(envpath).is_file():
+        write_error(f"No environment found for {toolname}, create it with `superscript venv --toolname {toolname}`")
+        raise typer.Exit()
+    write_verbose(f"Executing {ctx.args} in environment {envpath}")
+    execute_in_environment(envpath, toolpath, ctx.args, chdir=tooldir)
+
+
 # TODO: add path parameter to save file to
 @app.command()
 def urlfile(
     fileurl: str,
-    category: str = UNCATEGORIZED,
+    category: str = typer.Option(UNCATEGORIZED, autocompletion=complete_category),
     subfolder: bool = True,
     custompath: Path = typer.Argument(
         None,
@@ -294,15 +450,19 @@ def urlfile(
     name_version_ending_string = fileurl.rsplit("/", 1)[1]
     name, version_ending_string = name_version_ending_string.split("_", 1)
     version_string, ending = version_ending_string.rsplit(".", 1)
-    version = Version.convert_versionstring(version_string)
+    try:
+        version = Version.convert_versionstring(version_string)
+    except ValueError as e:
+        write_error(str(e))
+        raise typer.Exit()
     print(name, version, ending)
-    file = requests.get(fileurl)
+    file = session.get(fileurl)
     # last_updated = now()
     print(file.status_code)
     # proof if file is available
     if file.status_code == 200:
         # print(file.content)
-        basepath = superconfig["config"]["defaultpath"]
+        basepath = Path(superconfig["config"]["defaultpath"])
         # handle custom user path
         if custompath:
             check_path_create(custompath, ask=True)
@@ -310,17 +470,20 @@ def urlfile(
         # save file to corresponding path
         with open(basepath / name_version_ending_string, "wb+") as downloadfile:
             downloadfile.write(file.content)
+        # keeps the content verifiable by `superscript verify`
+        filehash = get_filehash(basepath / name_version_ending_string)
 
         # add component to config file
         add_component(
             name,
-            urlfile,
+            fileurl,
             basepath,
             subfolder=subfolder,
             custompath=custompath,
             category=category,
             component_type=TYPES['urlfile'],
-            version=version
+            version=version,
+            filehash=filehash
         )
 
         commitmessage = f"Add urlfile of {name} with version "
@@ -339,7 +502,7 @@ def collect(
         dir_okay=True,
         readable=True
     ),
-    category: str = UNCATEGORIZED,
+    category: str = typer.Option(UNCATEGORIZED, autocompletion=complete_category),
     recursive: bool = False
 ):
     """
@@ -395,8 +558,8 @@ def collect(
 
 @app.command()
 def update(
-    category: str = None,
-    toolname: str = None
+    category: str = typer.Option(None, autocompletion=complete_category),
+    toolname: str = typer.Option(None, autocompletion=complete_toolname)
 ):
     """
     Updates all configured or a specified tool.
@@ -409,6 +572,159 @@ def update(
     pass
 
 
+@app.command()
+def maintain(
+    category: str = typer.Option(None, autocompletion=complete_category),
+    workers: int = 4,
+    iolimit: int = typer.Option(None, help="Maximum number of repositories rewritten at the same time"),
+    aggressive: bool = False,
+    orphans: bool = True
+):
+    """
+    Runs git gc, repack and prune on all git tools and reports the saved disk space.
+
+    Also lists directories in the defaultpath which belong to no tool in the config.
+    """
+    toolconfigs = get_all_toolconfigs(category)
+    tools = {}
+    for tool, (toolconfig, toolcategory) in toolconfigs.items():
+        if toolconfig["type"] == TYPES["git"]:
+            tools[tool] = get_toolpath(tool, toolconfig, toolcategory)
+    write_info(f"Running maintenance for {len(tools)} git tools with {workers} workers")
+    results = maintain_repositories(tools, workers=workers, iolimit=iolimit, aggressive=aggressive)
+    total_before = 0
+    total_after = 0
+    for i, (tool, (before, after, error)) in enumerate(results.items()):
+        if error:
+            write_error(f"Maintenance of {tool} failed: {error}")
+            continue
+        total_before += before
+        total_after += after
+        write_count(f"{tool}: {format_size(before)} -> {format_size(after)}", i)
+    write_success(f"Total size of git directories: {format_size(total_before)} -> {format_size(total_after)}")
+    if orphans and category is None:
+        orphanpaths = find_orphans(superconfig["config"]["defaultpath"], [
+            get_toolpath(tool, toolconfig, toolcategory) for tool, (toolconfig, toolcategory) in toolconfigs.items()
+        ])
+        if orphanpaths:
+            write_info(f"The following directories in {superconfig['config']['defaultpath']} are not in the config:")
+            for i, orphanpath in enumerate(orphanpaths):
+                write_count(str(orphanpath), i)
+
+
+@app.command()
+def schedule(
+    once: bool = typer.Option(False, help="Check all due components once instead of running continuously"),
+    force: bool = typer.Option(False, help="Check all components, also if they are not due yet"),
+    workers: int = 4
+):
+    """
+    Periodically checks git, gitrelease and urlfile components for updates.
+
+    Intervals, jitter and rate budgets per host can be set in the schedule section of the config.
+    Results are written to a state file which list and status show without network access.
+    """
+    global superconfig
+    app_dir = Path(typer.get_app_dir(APP_NAME))
+    # keeps the tokens and backoffs of the hosts over all rounds
+    limiter = RateLimiter()
+    write_info("Starting update checks" if once else "Starting scheduler for update checks")
+    while True:
+        # pick up config changes between the rounds, only parsed again if the file changed
+        superconfig = load_superconfig(get_superconfig_path(app_dir))
+        scheduleconfig = superconfig["config"].get("schedule") or {}
+        limiter.update_budgets(scheduleconfig.get("budgets"))
+        tools = {
+            tool: (toolconfig, get_toolpath(tool, toolconfig, toolcategory))
+            for tool, (toolconfig, toolcategory) in get_all_toolconfigs().items()
+        }
+        wait = run_checks(
+            tools,
+            app_dir / UPDATE_STATE,
+            session,
+            limiter,
+            intervals=scheduleconfig.get("intervals"),
+            workers=workers,
+            force=force
+        )
+        force = False
+        if once or wait is None:
+            break
+        write_verbose(f"Next update check in {int(wait)} seconds")
+        time.sleep(wait)
+    write_success("Update checks finished")
+
+
+@app.command()
+def status():
+    """
+    Shows the results of the last update checks without network access.
+    """
+    updatestate = load_state(Path(typer.get_app_dir(APP_NAME)) / UPDATE_STATE)
+    if not updatestate:
+        write_info("No update checks done yet, run `superscript schedule --once`")
+        return
+    for i, (tool, toolstate) in enumerate(updatestate.items()):
+        checked = datetime.datetime.fromtimestamp(toolstate["checked"]).strftime("%Y-%m-%d %H:%M")
+        if toolstate.get("error"):
+            write_count(f"{tool}: check failed at {checked}: {toolstate['error']}", i)
+        elif toolstate.get("outdated"):
+            write_count(f"{tool}: update available ({toolstate['latest']}), checked {checked}", i)
+        else:
+            write_count(f"{tool}: up to date, checked {checked}", i)
+
+
+@app.command()
+def verify(
+    category: str = typer.Option(None, autocompletion=complete_category),
+    repair: bool = typer.Option(False, help="Bring all failed components in line with the config"),
+    full: bool = typer.Option(False, help="Inspect all components, also unchanged ones"),
+    workers: int = 8
+):
+    """
+    Verifies the installed components against the config.
+
+    Git tools are checked for their path, remote url and branch, urlfiles for presence and hash.
+    Only components changed since the last run are inspected again.
+    """
+    app_dir = Path(typer.get_app_dir(APP_NAME))
+    tools = {}
+    for tool, (toolconfig, toolcategory) in get_all_toolconfigs(category).items():
+        if toolconfig["type"] == TYPES["git"]:
+            tools[tool] = (toolconfig, get_toolpath(tool, toolconfig, toolcategory))
+        elif toolconfig["type"] == TYPES["urlfile"]:
+            tools[tool] = (toolconfig, get_urlfilepath(toolconfig))
+    write_info(f"Verifying {len(tools)} components")
+    # only a run over all categories knows which tools were removed from the config
+    results = verify_components(tools, app_dir / VERIFY_CACHE, workers=workers, full=full, prune=category is None)
+    failed = {tool: issues for tool, issues in results.items() if issues}
+    for i, (tool, issues) in enumerate(failed.items()):
+        write_count(tool, i)
+        for _, message in issues:
+            write_count(message, level=2)
+    if not failed:
+        write_success("All components match the config")
+        return
+    write_error(f"{len(failed)} of {len(tools)} components do not match the config")
+    if not repair:
+        return
+    updated = []
+    with typer.progressbar(failed.items(), label="Repairing components") as progress:
+        for tool, issues in progress:
+            toolconfig, toolpath = tools[tool]
+            try:
+                update = repair_component(toolconfig, toolpath, issues, session)
+            except (OSError, git.GitError, requests.RequestException, IntegrityError) as e:
+                write_error(f"Repairing {tool} failed: {e}")
+                continue
+            if update:
+                toolconfig.update(update)
+                updated.append(tool)
+    if updated:
+        save_superconfig(commitcontent=f"Add missing hashes of {', '.join(updated)}")
+    write_success("Repair finished, run verify again to check the result")
+
+
 @app.command()
 def save():
     """
@@ -419,6 +735,20 @@ def save():
     pass
 
 
+@app.command()
+def layout(
+    sharded: bool = typer.Option(True, help="One file per category instead of a single superconfig.yml")
+):
+    """
+    Switches the config storage between a single file and one file per category.
+
+    With one file per category only the touched categories are read and written by a command.
+    """
+    config_path = get_superconfig_path(Path(typer.get_app_dir(APP_NAME)))
+    convert_superconfig(config_path, sharded)
+    write_success("Config is stored with one file per category" if sharded else "Config is stored in a single file")
+
+
 @app.command()
 def export(
     filepath: Path = typer.Argument(
@@ -451,8 +781,8 @@ def restore(
         writable=True
     ),
     url: str = None,
-    category: str = None,
-    toolname: str = None
+    category: str = typer.Option(None, autocompletion=complete_category),
+    toolname: str = typer.Option(None, autocompletion=complete_toolname)
 ):
     """
     Restores configs, categories and/or tools from given configs.
@@ -490,71 +820,98 @@ def restore(
 
 @app.command()
 def readme(
-    toolname: str
+    toolname: str = typer.Argument(..., autocompletion=complete_toolname),
+    section: str = typer.Option(None, help="Only print the part below the first heading containing this text"),
+    pager: bool = True
 ):
     """
     Prints the markdown readme to the console.
     """
-    toolconfig, toolcategory = get_toolconfig(toolname)
-    if toolconfig:
+    toolpath = get_toolpath(toolname)
+    if toolpath:
         write_verbose(f"Found {toolname} in superconfig")
-        if "custompath" in toolconfig:
-            write_verbose(f"Custom path set for {toolname}")
-            default_readme = Path(toolconfig["custompath"]) / "README.md"
-        else:
-            write_verbose(f"Default path used for {toolname}")
-            toolpath = Path(superconfig["config"]["defaultpath"])
-            if toolcategory:
-                toolpath = toolpath / toolcategory
-            default_readme = toolpath / toolname / "README.md"
+        default_readme = toolpath / "README.md"
         if default_readme.is_file():
             write_verbose(f"README file exists for {toolname}")
-            with open(default_readme, 'r') as f:
-                markdown_content = f.read()
-            write_verbose(f"Converting and printing markdown to console")
-            md = Markdown(markdown_content)
-            console.print(md)
+            print_markdown(default_readme, section, pager)
 
 
 @app.command()
 def wiki(
-    toolname: str,
-    openwebpage: bool = False
+    toolname: str = typer.Argument(None, autocompletion=complete_toolname),
+    openwebpage: bool = False,
+    mirror: bool = typer.Option(False, help="Keep a shallow local clone of the wiki for offline reading"),
+    page: str = typer.Option(None, help="Print a page of the mirrored wiki to the console"),
+    refresh: bool = typer.Option(False, help="Ignore cached wiki existence results"),
+    workers: int = 8
 ):
     """
     Tries to get online wiki of the tool (currently only GitHub supported).
 
-    Checks the existence online, as the state may changes between cloning and wiki execution.
-    Better than storing this value (exists/not exists) to the config.
+    Without toolname the wikis of all tools are checked concurrently.
+    The existence is cached only for a short time, as the state may change after cloning.
+    Mirrored wikis are listed and printed without network access.
     """
-    toolconfig, toolcategory = get_toolconfig(toolname)
-    if toolconfig:
+    app_dir = Path(typer.get_app_dir(APP_NAME))
+    if toolname:
+        toolconfig, toolcategory = get_toolconfig(toolname)
+        if not toolconfig:
+            write_error(f"Tool {toolname} not found in superconfig")
+            raise typer.Exit()
         write_verbose(f"Found {toolname} in superconfig")
-        if toolconfig["url"]:
-            write_info(f"Searching for wiki of tool {toolname}")
-            wikiurl = "{url}/{wikipath}".format(url=toolconfig["url"].replace(GITENDING, ""), wikipath="wiki")
-            wikipage = requests.get(wikiurl, allow_redirects=False)
-            # proof if wiki is activated for the repository
-            # returns 200 if exists, 302 if not
-            write_verbose(f"Wiki URL {wikiurl} returned status code {wikipage.status_code}")
-            if wikipage.status_code == 200:
-                write_info(f"Wiki exists for {toolname}")
-                if openwebpage:
-                    typer.launch(wikiurl)
-                # TODO: list all wiki pages available online e.g. for mimikatz as good example
-            else:
-                write_info(f"Wiki does not exist for {toolname}")
+        tools = {toolname: toolconfig["url"]} if toolconfig.get("url") else {}
+    else:
+        tools = {}
+        for tool, (toolconfig, _) in get_all_toolconfigs().items():
+            if toolconfig.get("url") and toolconfig["type"] != TYPES["urlfile"]:
+                tools[tool] = toolconfig["url"]
+    mirrorpath = app_dir / WIKI_FOLDER
+    # a mirrored wiki exists, no need to ask online
+    if toolname and page and (mirrorpath / toolname / GITENDING).is_dir() and not mirror:
+        results = {toolname: True}
+    else:
+        write_info(f"Searching for wikis of {len(tools)} tools" if not toolname else f"Searching for wiki of tool {toolname}")
+        results = check_wikis(tools, session, app_dir / WIKI_CACHE, workers=workers, refresh=refresh)
+    for i, (tool, exists) in enumerate(results.items()):
+        if isinstance(exists, Exception):
+            write_error(f"Checking wiki of {tool} failed: {exists}")
+        elif exists:
+            write_info(f"Wiki exists for {tool}")
+            if openwebpage and tool in tools:
+                typer.launch(get_wikiurl(tools[tool]))
+            if mirror:
+                check_path_create(mirrorpath)
+                try:
+                    mirror_wiki(tools[tool], mirrorpath / tool)
+                    write_success(f"Mirrored wiki of {tool}")
+                except git.GitCommandError as e:
+                    write_error(f"Mirroring wiki of {tool} failed: {e}")
+        elif toolname:
+            write_info(f"Wiki does not exist for {tool}")
+    if toolname and (mirrorpath / toolname / GITENDING).is_dir():
+        if page:
+            wikipage = find_wikipage(mirrorpath / toolname, page)
+            if not wikipage:
+                write_error(f"No wiki page {page} found for {toolname}")
+                raise typer.Exit()
+            print_markdown(wikipage)
+        else:
+            write_info(f"Wiki pages of {toolname}:")
+            for i, wikipage in enumerate(list_wikipages(mirrorpath / toolname)):
+                write_count(wikipage, i)
 
 
 @app.command()
-def list(categorized: bool = False, category: str = None):
+def list(categorized: bool = False, category: str = typer.Option(None, autocompletion=complete_category)):
     """
     Lists all tools in config.
     """
-    all_tools, categories = get_all_tools()
+    all_tools, categories = get_all_tools(category)
     write_info("The following tools are installed:")
     last_category = ""
     level = 1
+    # results of the scheduler, shown without touching the network
+    updatestate = load_state(Path(typer.get_app_dir(APP_NAME)) / UPDATE_STATE)
     # Q: reenumerate if category output, otherwise the numbering may confuse?
     for i, tool in enumerate(all_tools):
         if category:
@@ -567,7 +924,10 @@ def list(categorized: bool = False, category: str = None):
                 last_category = categories[i]
             level = 2
         if category and (categories[i] == category) or category is None:
-            write_count(tool, i, level)
+            if updatestate.get(tool, {}).get("outdated"):
+                write_count(f"{tool} (update available)", i, level)
+            else:
+                write_count(tool, i, level)
         last_category = categories[i]
 
 
@@ -586,6 +946,27 @@ def search(searchtoolname: str):
         write_info("There was no matching tool found")
 
 
+def reset_state():
+    state["verbose"] = False
+
+
+@app.command()
+def daemon():
+    """
+    Runs superscript as resident daemon, the CLI forwards its commands over a unix socket to it.
+
+    Keeps the parsed config and open HTTP connections in memory between commands.
+    Without a running daemon all commands are executed in-process as usual.
+    execute, schedule and commands which may prompt are never forwarded.
+    """
+    socketpath = get_socketpath()
+    write_info(f"Daemon listening on {socketpath}")
+    try:
+        serve(typer.main.get_command(app), socketpath, prog_name=APP_NAME, before_request=reset_state)
+    except KeyboardInterrupt:
+        write_info("Daemon stopped")
+
+
 # with typer.progressbar(range(100)) as progress:
 #   for value in progress:
 #       pass
@@ -0,0 +1,15 @@
+import sys
+from pathlib import Path
+
+import pytest
+
+# the helper modules import each other by their plain names, the CLI runs with its folder on the path
+sys.path.insert(0, str(Path(__file__).parent.parent / "superscript" / "helper"))
+
+from settings import Settings  # noqa: E402
+
+
+@pytest.fixture(autouse=True)
+def settings(monkeypatch):
+    # set by the callback of the CLI, which the helper tests don't run
+    monkeypatch.setattr(Settings, "debug", False, raising=False)
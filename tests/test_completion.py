@@ -0,0 +1,57 @@
+import json
+
+from superscript.helper.completion import write_completion_cache, read_completion_cache
+from superscript.helper.configuration import ShardedComponents
+from superscript.helper.cachedcompletion import get_candidates
+
+
+COMMANDS = {
+    "readme": {"options": ["--section", "--pager", "--no-pager"], "values": {"--section": None}, "arguments": ["tools"]},
+    "list": {"options": ["--categorized", "--category"], "values": {"--category": "categories"}, "arguments": []}
+}
+
+
+class TestCompletionCache:
+    def test_write_completion_cache(self, tmp_path):
+        cachepath = tmp_path / "completion.json"
+        superconfig = {"components": {"(uncategorized)": {"ffuf": {}}, "Web": {"gobuster": {}, "dirb": {}}}}
+        write_completion_cache(cachepath, superconfig)
+        completion = read_completion_cache(cachepath)
+        assert completion["tools"] == ["dirb", "ffuf", "gobuster"]
+        assert completion["categories"] == ["(uncategorized)", "Web"]
+        assert completion["components"]["Web"] == ["dirb", "gobuster"]
+
+    def test_unloaded_shards_keep_cached_tools(self, tmp_path):
+        cachepath = tmp_path / "completion.json"
+        shardpath = tmp_path / "components"
+        shardpath.mkdir()
+        (shardpath / "Web.yml").write_text("gobuster: {}\n")
+        cachepath.write_text(json.dumps({"components": {"Web": ["gobuster"]}, "commands": COMMANDS}))
+        components = ShardedComponents(shardpath)
+        write_completion_cache(cachepath, {"components": components})
+        assert not components.is_loaded("Web")
+        completion = read_completion_cache(cachepath)
+        assert completion["tools"] == ["gobuster"]
+        # outside of a running command the options are kept from the previous cache
+        assert completion["commands"] == COMMANDS
+
+
+class TestCachedCompletion:
+    completion = {"tools": ["ffuf", "gobuster"], "categories": ["Web"], "commands": COMMANDS}
+
+    def test_commands(self):
+        assert get_candidates(self.completion, [], "") == ["list", "readme"]
+
+    def test_argument(self):
+        assert get_candidates(self.completion, ["--verbose", "readme"], "f") == ["ffuf", "gobuster"]
+
+    def test_option_value(self):
+        assert get_candidates(self.completion, ["list", "--category"], "") == ["Web"]
+
+    def test_options(self):
+        assert get_candidates(self.completion, ["readme"], "--") == COMMANDS["readme"]["options"]
+
+    def test_unknown_falls_back(self):
+        assert get_candidates(self.completion, ["readme", "--section"], "") is None
+        assert get_candidates(self.completion, ["readme", "ffuf"], "") is None
+        assert get_candidates(self.completion, [], "--") is None
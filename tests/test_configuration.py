@@ -0,0 +1,60 @@
+import yaml
+
+from superscript.helper import configuration
+from superscript.helper.configuration import ShardedComponents, write_superconfig
+
+
+def create_shards(tmp_path):
+    shardpath = tmp_path / "components"
+    shardpath.mkdir()
+    (shardpath / "Web.yml").write_text(yaml.dump({"gobuster": {"type": "git", "url": "https://github.com/OJ/gobuster"}}))
+    (shardpath / "Tunneling%2FSSH.yml").write_text(yaml.dump({"ssf": {"type": "git", "url": "https://github.com/securesocketfunneling/ssf"}}))
+    (tmp_path / "config.yml").write_text(yaml.dump({"config": {"gitvcs": False}}))
+    return shardpath
+
+
+class TestShardedComponents:
+    def test_categories_without_loading(self, tmp_path):
+        components = ShardedComponents(create_shards(tmp_path))
+        assert sorted(components) == ["Tunneling/SSH", "Web"]
+        assert "Web" in components
+        assert not components.is_loaded("Web")
+
+    def test_lazy_loading(self, tmp_path):
+        components = ShardedComponents(create_shards(tmp_path))
+        assert "gobuster" in components["Web"]
+        assert components.is_loaded("Web")
+        assert not components.is_loaded("Tunneling/SSH")
+
+    def test_set_and_delete(self, tmp_path):
+        components = ShardedComponents(create_shards(tmp_path))
+        components["Recon"] = {}
+        del components["Web"]
+        assert sorted(components) == ["Recon", "Tunneling/SSH"]
+        assert components.removed == {"Web"}
+
+    def test_save_writes_only_changed_shard(self, tmp_path, monkeypatch):
+        shardpath = create_shards(tmp_path)
+        components = ShardedComponents(shardpath)
+        superconfig = {"config": {"gitvcs": False}, "components": components}
+        monkeypatch.setattr(configuration, "superconfig", superconfig, raising=False)
+        sshmtime = (shardpath / "Tunneling%2FSSH.yml").stat().st_mtime_ns
+        components["Web"]["ffuf"] = {"type": "git", "url": "https://github.com/ffuf/ffuf"}
+        # read but unchanged
+        components["Tunneling/SSH"]
+        written, removed = write_superconfig(tmp_path / "config.yml")
+        assert written == [shardpath / "Web.yml"]
+        assert removed == []
+        assert (shardpath / "Tunneling%2FSSH.yml").stat().st_mtime_ns == sshmtime
+        assert "ffuf" in yaml.safe_load((shardpath / "Web.yml").read_text())
+
+    def test_save_removes_deleted_shard(self, tmp_path, monkeypatch):
+        shardpath = create_shards(tmp_path)
+        components = ShardedComponents(shardpath)
+        superconfig = {"config": {"gitvcs": False}, "components": components}
+        monkeypatch.setattr(configuration, "superconfig", superconfig, raising=False)
+        del components["Web"]
+        written, removed = write_superconfig(tmp_path / "config.yml")
+        assert written == []
+        assert removed == [shardpath / "Web.yml"]
+        assert not (shardpath / "Web.yml").exists()
@@ -0,0 +1,98 @@
+import os
+import sys
+import time
+import threading
+import subprocess
+from pathlib import Path
+
+import click
+import pytest
+
+from superscript.helper.daemon import get_subcommand, forward, serve
+
+HELPERPATH = str(Path(__file__).parent.parent / "superscript" / "helper")
+# the daemon redirects the output of its whole process, so the client runs in another one
+CLIENT = "import sys, pathlib, daemon; sys.exit(daemon.forward(sys.argv[2:], pathlib.Path(sys.argv[1])))"
+
+
+class TestForward:
+    @pytest.mark.parametrize(
+        "argv,subcommand",
+        [
+            (["list"], "list"),
+            (["--verbose", "readme", "tool"], "readme"),
+            (["--installpath", "/opt/tools", "wiki"], "wiki"),
+            (["--installpath=/opt/tools", "status"], "status"),
+            (["--verbose"], None),
+            ([], None)
+        ]
+    )
+    def test_get_subcommand(self, argv, subcommand):
+        assert get_subcommand(argv) == subcommand
+
+    @pytest.mark.parametrize("argv", [["execute", "tool"], ["schedule"], ["daemon"], []])
+    def test_in_process_commands_are_not_forwarded(self, argv, tmp_path):
+        # the socket exists, but the command has to run in-process anyway
+        socketpath = tmp_path / "superscript.sock"
+        socketpath.touch()
+        assert forward(argv, socketpath) is None
+
+
+@click.group()
+def cli():
+    pass
+
+
+@cli.command()
+@click.option("--exitcode", default=0)
+def hello(exitcode):
+    click.echo("to stdout")
+    click.echo("to stderr", err=True)
+    click.echo(f"cwd {os.getcwd()}")
+    click.echo(f"columns {os.environ.get('COLUMNS')}")
+    sys.exit(exitcode)
+
+
+@cli.command()
+def ask():
+    click.confirm("Continue?", abort=True)
+    click.echo("confirmed")
+
+
+class TestServe:
+    @pytest.fixture
+    def socketpath(self, tmp_path):
+        socketpath = tmp_path / "superscript.sock"
+        # runs until the test session ends, every request restores the cwd and environment
+        threading.Thread(target=serve, args=(cli, socketpath, "superscript"), daemon=True).start()
+        for _ in range(100):
+            if socketpath.exists():
+                break
+            time.sleep(0.05)
+        return socketpath
+
+    def run_client(self, socketpath, cwd, *argv):
+        return subprocess.run(
+            [sys.executable, "-c", CLIENT, str(socketpath), *argv],
+            cwd=str(cwd),
+            env=dict(os.environ, PYTHONPATH=HELPERPATH, COLUMNS="55"),
+            capture_output=True,
+            text=True,
+            timeout=30
+        )
+
+    def test_round_trip(self, socketpath, tmp_path):
+        workdir = os.getcwd()
+        columns = os.environ.get("COLUMNS")
+        result = self.run_client(socketpath, tmp_path, "hello", "--exitcode", "3")
+        assert result.returncode == 3
+        assert result.stdout.splitlines() == ["to stdout", f"cwd {tmp_path}", "columns 55"]
+        assert result.stderr == "to stderr\n"
+        assert os.getcwd() == workdir
+        assert os.environ.get("COLUMNS") == columns
+
+    def test_prompt_aborts(self, socketpath, tmp_path):
+        result = self.run_client(socketpath, tmp_path, "ask")
+        assert result.returncode == 1
+        assert "Aborted!" in result.stderr
+        assert "confirmed" not in result.stdout
@@ -0,0 +1,62 @@
+import subprocess
+
+import pytest
+
+from superscript.helper import environments
+from superscript.helper.environments import get_wheel_lock, get_envpython, create_environment, is_environment_current
+
+
+class TestWheelLock:
+    def test_same_requirements_share_lock(self, tmp_path):
+        (tmp_path / "a.txt").write_text("requests==2.28.1\n")
+        (tmp_path / "b.txt").write_text("requests==2.28.1\n")
+        assert get_wheel_lock(tmp_path / "a.txt") is get_wheel_lock(tmp_path / "b.txt")
+
+    def test_different_requirements_build_in_parallel(self, tmp_path):
+        (tmp_path / "a.txt").write_text("requests==2.28.1\n")
+        (tmp_path / "b.txt").write_text("pyyaml==6.0\n")
+        assert get_wheel_lock(tmp_path / "a.txt") is not get_wheel_lock(tmp_path / "b.txt")
+
+
+class TestCreateEnvironment:
+    def create_tool(self, tmp_path, requirements="requests==2.28.1\n"):
+        toolpath = tmp_path / "tool"
+        toolpath.mkdir()
+        (toolpath / "requirements.txt").write_text(requirements)
+        # an environment left behind by an interrupted or failed run
+        envpath = tmp_path / "venvs" / "tool"
+        get_envpython(envpath).parent.mkdir(parents=True)
+        get_envpython(envpath).touch()
+        return toolpath, envpath
+
+    def test_failed_install_is_retried(self, tmp_path, monkeypatch):
+        toolpath, envpath = self.create_tool(tmp_path)
+        installs = []
+        failing = [True]
+
+        def build_wheels(requirements, wheelcache):
+            if failing[0]:
+                raise subprocess.CalledProcessError(1, "pip wheel")
+        monkeypatch.setattr(environments, "build_wheels", build_wheels)
+        monkeypatch.setattr(environments.subprocess, "run", lambda arguments, **kwargs: installs.append(arguments))
+        with pytest.raises(subprocess.CalledProcessError):
+            create_environment(toolpath, envpath, tmp_path / "wheels", tmp_path / "site-store")
+        assert not is_environment_current(envpath, toolpath / "requirements.txt")
+        failing[0] = False
+        create_environment(toolpath, envpath, tmp_path / "wheels", tmp_path / "site-store")
+        assert len(installs) == 1
+        assert is_environment_current(envpath, toolpath / "requirements.txt")
+        # complete environments are skipped
+        create_environment(toolpath, envpath, tmp_path / "wheels", tmp_path / "site-store")
+        assert len(installs) == 1
+
+    def test_changed_requirements_are_installed(self, tmp_path, monkeypatch):
+        toolpath, envpath = self.create_tool(tmp_path)
+        installs = []
+        monkeypatch.setattr(environments, "build_wheels", lambda requirements, wheelcache: None)
+        monkeypatch.setattr(environments.subprocess, "run", lambda arguments, **kwargs: installs.append(arguments))
+        create_environment(toolpath, envpath, tmp_path / "wheels", tmp_path / "site-store")
+        (toolpath / "requirements.txt").write_text("requests==2.31.0\n")
+        assert not is_environment_current(envpath, toolpath / "requirements.txt")
+        create_environment(toolpath, envpath, tmp_path / "wheels", tmp_path / "site-store")
+        assert len(installs) == 2
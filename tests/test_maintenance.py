@@ -0,0 +1,24 @@
+import pytest
+
+from superscript.helper.maintenance import find_orphans, format_size
+
+
+class TestMaintenance:
+    def test_find_orphans(self, tmp_path):
+        for folder in ("ffuf", "Web/gobuster", "Web/dirb", "removed", "Recon/old/nested"):
+            (tmp_path / folder).mkdir(parents=True)
+        (tmp_path / "notes.txt").write_text("files are no orphans")
+        orphans = find_orphans(tmp_path, [tmp_path / "ffuf", tmp_path / "Web" / "gobuster"])
+        expected = [tmp_path / "Recon", tmp_path / "Web" / "dirb", tmp_path / "removed"]
+        assert orphans == sorted(path.resolve() for path in expected)
+
+    def test_find_orphans_ignores_inside_tools(self, tmp_path):
+        (tmp_path / "ffuf" / "docs").mkdir(parents=True)
+        assert find_orphans(tmp_path, [tmp_path / "ffuf"]) == []
+
+    def test_find_orphans_missing_basepath(self, tmp_path):
+        assert find_orphans(tmp_path / "missing", []) == []
+
+    @pytest.mark.parametrize("size,formatted", [(512, "512 B"), (2048, "2.0 KiB"), (5 * 1024 ** 3, "5.0 GiB")])
+    def test_format_size(self, size, formatted):
+        assert format_size(size) == formatted
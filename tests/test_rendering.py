@@ -0,0 +1,62 @@
+import os
+
+from superscript.helper.rendering import extract_section, render_markdown
+
+README = """# Tool
+
+intro
+
+## Installation
+
+pip install tool
+
+```
+# not a heading
+```
+
+### From source
+
+git clone
+
+## Usage
+
+tool -h
+"""
+
+
+class TestExtractSection:
+    def test_section_with_subsections(self):
+        section = extract_section(README, "install")
+        assert section.startswith("## Installation")
+        assert "### From source" in section
+        assert "## Usage" not in section
+
+    def test_headings_in_code_blocks_are_ignored(self):
+        assert extract_section(README, "not a heading") is None
+
+    def test_last_section(self):
+        assert extract_section(README, "USAGE") == "## Usage\n\ntool -h\n"
+
+    def test_missing_section(self):
+        assert extract_section(README, "license") is None
+
+
+class TestRenderMarkdown:
+    def test_cached_rendering_is_reused(self, tmp_path):
+        readme = tmp_path / "README.md"
+        readme.write_text(README)
+        cachepath = render_markdown(readme, tmp_path / "cache", 80, color=False)
+        assert "intro" in cachepath.read_text()
+        assert render_markdown(readme, tmp_path / "cache", 80, color=False) == cachepath
+        assert render_markdown(readme, tmp_path / "cache", 80, color=False, section="license") is None
+
+    def test_outdated_renderings_are_evicted(self, tmp_path):
+        readme = tmp_path / "README.md"
+        readme.write_text(README)
+        render_markdown(readme, tmp_path / "cache", 80, color=False)
+        render_markdown(readme, tmp_path / "cache", 40, color=False)
+        assert len(list((tmp_path / "cache").iterdir())) == 2
+        readme.write_text(README + "\nchanged\n")
+        os.utime(readme, ns=(0, 0))
+        cachepath = render_markdown(readme, tmp_path / "cache", 80, color=False)
+        assert list((tmp_path / "cache").iterdir()) == [cachepath]
@@ -0,0 +1,114 @@
+import pytest
+import requests
+
+from superscript.helper import scheduler
+from superscript.helper.scheduler import RateLimiter, RateLimitExceeded, get_next_urls, get_host, check_component, \
+    get_request_count
+
+
+def get_response(status_code):
+    response = requests.Response()
+    response.status_code = status_code
+    return response
+
+
+class TestRateLimiter:
+    def test_budget(self):
+        limiter = RateLimiter({"example.com": (2, 3600)})
+        assert limiter.acquire("example.com")
+        assert limiter.acquire("example.com")
+        assert not limiter.acquire("example.com")
+        # other hosts have their own budget
+        assert limiter.acquire("github.com")
+
+    def test_acquire_multiple_requests(self):
+        limiter = RateLimiter({"example.com": (6, 3600)})
+        assert limiter.acquire("example.com", 4)
+        assert not limiter.acquire("example.com", 4)
+        assert limiter.acquire("example.com", 2)
+
+    def test_acquire_more_than_capacity(self):
+        limiter = RateLimiter({"example.com": (2, 3600)})
+        assert limiter.acquire("example.com", 4)
+        assert not limiter.acquire("example.com")
+
+    def test_update_budgets(self):
+        limiter = RateLimiter({"example.com": (1, 3600)})
+        limiter.update_budgets({"example.com": (5, 60)})
+        assert limiter.budgets["example.com"] == (5, 60)
+        assert "default" in limiter.budgets
+
+    def test_penalize_blocks_host(self):
+        limiter = RateLimiter()
+        limiter.penalize("example.com")
+        assert not limiter.acquire("example.com")
+        assert limiter.acquire("github.com")
+
+    def test_backoff_doubles_until_success(self):
+        limiter = RateLimiter()
+        limiter.penalize("example.com")
+        first = limiter.backoff["example.com"]
+        limiter.penalize("example.com")
+        assert limiter.backoff["example.com"] == 2 * first
+        limiter.success("example.com")
+        assert "example.com" not in limiter.backoff
+
+    def test_retry_after(self):
+        limiter = RateLimiter()
+        limiter.penalize("example.com", retry_after=100000)
+        assert limiter.blocked_until["example.com"] - limiter.backoff["example.com"] > 90000
+
+
+class TestUpdateChecks:
+    @pytest.mark.parametrize(
+        "url,host",
+        [
+            ("https://github.com/ffuf/ffuf.git", "github.com"),
+            ("git@gitlab.com:user/tool.git", "gitlab.com")
+        ]
+    )
+    def test_get_host(self, url, host):
+        assert get_host(url) == host
+
+    def test_get_next_urls(self):
+        assert get_next_urls("https://didierstevens.com/files/software/oledump_V0_0_53.zip", "0.0.53") == [
+            "https://didierstevens.com/files/software/oledump_V0_0_54.zip",
+            "https://didierstevens.com/files/software/oledump_V0_1_0.zip",
+            "https://didierstevens.com/files/software/oledump_V1_0_0.zip"
+        ]
+
+    def test_get_next_urls_without_version(self):
+        assert get_next_urls("https://example.com/files/tool_1_2_3.py", None) == []
+        assert get_next_urls("https://example.com/files/tool_1_2.py", "1.2") == []
+
+    def test_get_request_count(self):
+        urlfile = {"type": "urlfile", "url": "https://didierstevens.com/files/software/oledump_V0_0_53.zip"}
+        assert get_request_count(dict(urlfile, version="0.0.53")) == 4
+        assert get_request_count(urlfile) == 1
+        assert get_request_count({"type": "git", "url": "https://github.com/ffuf/ffuf"}) == 1
+
+    @pytest.mark.parametrize(
+        "error,penalized",
+        [
+            (LookupError("Branch main not found on remote"), False),
+            (requests.HTTPError("404", response=get_response(404)), False),
+            (requests.HTTPError("503", response=get_response(503)), True),
+            (requests.ConnectionError("refused"), True)
+        ]
+    )
+    def test_check_component_penalizes_only_host_errors(self, monkeypatch, error, penalized):
+        def failing_check(toolconfig, toolpath, session):
+            raise error
+        monkeypatch.setitem(scheduler.CHECKS, "git", failing_check)
+        limiter = RateLimiter()
+        result = check_component("ffuf", {"type": "git", "url": "https://github.com/ffuf/ffuf"}, None, None, limiter)
+        assert result["error"] == str(error)
+        assert ("github.com" in limiter.blocked_until) == penalized
+
+    def test_check_component_postpones_on_rate_limit(self, monkeypatch):
+        def limited_check(toolconfig, toolpath, session):
+            raise RateLimitExceeded("github.com", 120)
+        monkeypatch.setitem(scheduler.CHECKS, "git", limited_check)
+        limiter = RateLimiter()
+        assert check_component("ffuf", {"type": "git", "url": "https://github.com/ffuf/ffuf"}, None, None, limiter) is None
+        assert not limiter.acquire("github.com")
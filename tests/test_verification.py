@@ -0,0 +1,84 @@
+import os
+import hashlib
+
+import pytest
+import requests
+
+from superscript.helper.verification import verify_components, load_verifycache, repair_component, \
+    IntegrityError, HASH, MISSING, NOHASH
+
+
+def create_urlfile(tmp_path, name, content=b"print('tool')\n"):
+    filepath = tmp_path / name
+    filepath.write_bytes(content)
+    toolconfig = {"type": "urlfile", "url": f"https://example.com/{name}", "sha256": hashlib.sha256(content).hexdigest()}
+    return toolconfig, filepath
+
+
+class DownloadSession:
+    def __init__(self, content):
+        self.content = content
+
+    def get(self, url, **kwargs):
+        response = requests.Response()
+        response.status_code = 200
+        response._content = self.content
+        return response
+
+
+class TestVerifyComponents:
+    def test_unchanged_components_are_taken_from_cache(self, tmp_path):
+        cachepath = tmp_path / "verifycache.json"
+        toolconfig, filepath = create_urlfile(tmp_path, "tool.py")
+        assert verify_components({"tool": (toolconfig, filepath)}, cachepath) == {"tool": []}
+        # same size and mtime, so the fingerprint does not change and the file is not hashed again
+        stat = filepath.stat()
+        filepath.write_bytes(b"print('evil')\n")
+        os.utime(filepath, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+        assert verify_components({"tool": (toolconfig, filepath)}, cachepath) == {"tool": []}
+        issues = verify_components({"tool": (toolconfig, filepath)}, cachepath, full=True)["tool"]
+        assert [code for code, _ in issues] == [HASH]
+
+    def test_missing_and_unhashed(self, tmp_path):
+        toolconfig, filepath = create_urlfile(tmp_path, "tool.py")
+        del toolconfig["sha256"]
+        results = verify_components(
+            {"missing": (toolconfig, tmp_path / "missing.py"), "tool": (toolconfig, filepath)},
+            tmp_path / "verifycache.json"
+        )
+        assert [code for code, _ in results["missing"]] == [MISSING]
+        assert [code for code, _ in results["tool"]] == [NOHASH]
+
+    def test_cache_is_merged(self, tmp_path):
+        cachepath = tmp_path / "verifycache.json"
+        first = create_urlfile(tmp_path, "first.py")
+        second = create_urlfile(tmp_path, "second.py")
+        verify_components({"first": first, "second": second}, cachepath)
+        # a run over a part of the tools keeps the others
+        verify_components({"first": first}, cachepath, prune=False)
+        assert sorted(load_verifycache(cachepath)) == ["first", "second"]
+        # a run over all tools drops the removed ones
+        verify_components({"first": first}, cachepath)
+        assert sorted(load_verifycache(cachepath)) == ["first"]
+
+
+class TestRepairComponent:
+    def test_download_matching_recorded_hash(self, tmp_path):
+        toolconfig, filepath = create_urlfile(tmp_path, "tool.py")
+        filepath.unlink()
+        update = repair_component(toolconfig, filepath, [[MISSING, ""]], DownloadSession(b"print('tool')\n"))
+        assert update == {}
+        assert filepath.read_bytes() == b"print('tool')\n"
+
+    def test_download_differing_from_recorded_hash(self, tmp_path):
+        toolconfig, filepath = create_urlfile(tmp_path, "tool.py")
+        filepath.write_bytes(b"print('changed')\n")
+        with pytest.raises(IntegrityError):
+            repair_component(toolconfig, filepath, [[HASH, ""]], DownloadSession(b"print('evil')\n"))
+        assert filepath.read_bytes() == b"print('changed')\n"
+
+    def test_missing_hash_is_recorded(self, tmp_path):
+        toolconfig, filepath = create_urlfile(tmp_path, "tool.py")
+        del toolconfig["sha256"]
+        update = repair_component(toolconfig, filepath, [[NOHASH, ""]], DownloadSession(b""))
+        assert update == {"sha256": hashlib.sha256(b"print('tool')\n").hexdigest()}
@@ -0,0 +1,68 @@
+import pytest
+
+from superscript.helper.versioning import Version, resolve_tag
+
+
+class TestVersion:
+    def test_ordering(self):
+        assert Version("v1.2.0-rc1") < Version("v1.2.0") < Version("v1.10.0")
+        assert Version("1.2") == Version("v1.2.0")
+        assert len({Version("1.2"), Version("v1.2.0")}) == 1
+
+    def test_prerelease_ordering(self):
+        assert Version("1.0.0-rc9") < Version("1.0.0-rc10") < Version("1.0.0")
+        assert Version("1.0.0-alpha") < Version("1.0.0-alpha.1") < Version("1.0.0-beta") < Version("1.0.0-beta.2")
+
+    def test_revision_ordering(self):
+        release, first, second = (Version.from_tag(tag) for tag in ("2.2.0", "2.2.0-20210810", "2.2.0-20220919"))
+        assert release < first < second < Version.from_tag("2.2.1-rc1")
+        assert second.is_stable()
+
+    def test_invalid_versionstring(self):
+        with pytest.raises(ValueError):
+            Version.convert_versionstring("nightly")
+
+    @pytest.mark.parametrize(
+        "tagname,versionstring",
+        [
+            ("refs/tags/v2.0.0^{}", "v2.0.0"),
+            ("tool-2.3.10", "v2.3.10"),
+            ("v2.4.0-rc1", "v2.4.0-rc1"),
+            ("v1.0.0-beta-2", "v1.0.0-beta-2"),
+            ("v3.0.0-alpha-1", "v3.0.0-alpha-1"),
+            ("v1.2.3-1", "v1.2.3-1"),
+            ("2.2.0-20220919", "v2.2.0-20220919"),
+            ("2023-01-15", "v2023.1.15"),
+            ("nightly", None)
+        ]
+    )
+    def test_from_tag(self, tagname, versionstring):
+        version = Version.from_tag(tagname)
+        assert (version.get_versionstring() if version else None) == versionstring
+
+
+class TestResolveTag:
+    tagnames = ["refs/tags/v1.0.0", "v2.3.1", "tool-2.3.10", "v2.4.0-rc1", "release_3.0", "nightly"]
+
+    @pytest.mark.parametrize(
+        "constraint,tagname",
+        [
+            ("latest", "release_3.0"),
+            ("latest stable 2.x", "tool-2.3.10"),
+            ("latest pre 2.x", "v2.4.0-rc1"),
+            ("1.x", "refs/tags/v1.0.0"),
+            ("4.x", None)
+        ]
+    )
+    def test_resolve_tag(self, constraint, tagname):
+        assert resolve_tag(self.tagnames, constraint)[0] == tagname
+
+    def test_numbered_prerelease(self):
+        assert resolve_tag(["v1.0.0-rc9", "v1.0.0-rc10"], "latest pre 1.x")[0] == "v1.0.0-rc10"
+
+    def test_revisions_are_stable(self):
+        tagnames = ["2.1.1-20200807", "2.2.0-20210810", "2.2.0-20220919"]
+        assert resolve_tag(tagnames, "latest stable")[0] == "2.2.0-20220919"
+
+    def test_hyphenated_prerelease_is_not_stable(self):
+        assert resolve_tag(["v1.0.0", "v1.1.0-beta-2"], "latest stable")[0] == "v1.0.0"
@@ -0,0 +1,57 @@
+import time
+
+import requests
+
+from superscript.helper.wikis import check_wikis, load_wikicache, save_wikicache, get_wikiurl
+
+TOOLS = {"ffuf": "https://github.com/ffuf/ffuf.git", "gobuster": "https://github.com/OJ/gobuster"}
+
+
+class WikiSession:
+    """
+    Answers wiki requests with fixed status codes and counts them.
+    """
+    def __init__(self, status_codes):
+        self.status_codes = status_codes
+        self.requested = []
+
+    def get(self, url, **kwargs):
+        self.requested.append(url)
+        response = requests.Response()
+        response.status_code = self.status_codes[url]
+        return response
+
+
+class TestCheckWikis:
+    def test_get_wikiurl(self):
+        assert get_wikiurl(TOOLS["ffuf"]) == "https://github.com/ffuf/ffuf/wiki"
+
+    def test_results_are_cached(self, tmp_path):
+        cachepath = tmp_path / "wikicache.json"
+        session = WikiSession({get_wikiurl(TOOLS["ffuf"]): 200, get_wikiurl(TOOLS["gobuster"]): 302})
+        assert check_wikis(TOOLS, session, cachepath) == {"ffuf": True, "gobuster": False}
+        assert check_wikis(TOOLS, session, cachepath) == {"ffuf": True, "gobuster": False}
+        assert len(session.requested) == 2
+
+    def test_expired_results_are_checked_again(self, tmp_path):
+        cachepath = tmp_path / "wikicache.json"
+        wikiurl = get_wikiurl(TOOLS["ffuf"])
+        save_wikicache(cachepath, {"ffuf": {"url": wikiurl, "exists": False, "checked": time.time() - 7200}})
+        session = WikiSession({wikiurl: 200})
+        assert check_wikis({"ffuf": TOOLS["ffuf"]}, session, cachepath, ttl=3600) == {"ffuf": True}
+        assert session.requested == [wikiurl]
+        assert load_wikicache(cachepath)["ffuf"]["exists"]
+
+    def test_refresh_ignores_cache(self, tmp_path):
+        cachepath = tmp_path / "wikicache.json"
+        wikiurl = get_wikiurl(TOOLS["ffuf"])
+        save_wikicache(cachepath, {"ffuf": {"url": wikiurl, "exists": False, "checked": time.time()}})
+        session = WikiSession({wikiurl: 200})
+        assert check_wikis({"ffuf": TOOLS["ffuf"]}, session, cachepath, refresh=True) == {"ffuf": True}
+
+    def test_errors_are_not_cached(self, tmp_path):
+        cachepath = tmp_path / "wikicache.json"
+        wikiurl = get_wikiurl(TOOLS["ffuf"])
+        session = WikiSession({wikiurl: 429})
+        assert isinstance(check_wikis({"ffuf": TOOLS["ffuf"]}, session, cachepath)["ffuf"], requests.HTTPError)
+        assert "ffuf" not in load_wikicache(cachepath)